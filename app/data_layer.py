@@ -377,15 +377,13 @@ class DataLayer:
                 }
             else:
                 # Legacy behavior: complete deletion when no item context
-                from app.repositories.chord_charts import ChordChartRepository
-                with DatabaseTransaction() as db:
-                    repo = ChordChartRepository(db)
-                    deleted_count = repo.batch_delete(chord_ids)
-                    return {
-                        "success": True,
-                        "deleted": chord_ids[:deleted_count],  # IDs that were actually deleted
-                        "deleted_count": deleted_count
-                    }
+                service = ChordChartService()
+                deleted_count = service.batch_delete(chord_ids)
+                return {
+                    "success": True,
+                    "deleted": chord_ids[:deleted_count],  # IDs that were actually deleted
+                    "deleted_count": deleted_count
+                }
         else:
             return sheets.batch_delete_chord_charts(chord_ids)
     
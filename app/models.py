@@ -42,7 +42,10 @@ class Routine(Base):
     order = Column(Integer, default=0, index=True)
     
     # Relationships
-    routine_items = relationship("RoutineItem", back_populates="routine", cascade="all, delete-orphan")
+    # Ordered by RoutineItem.id = physical insertion order (the order column is display-only).
+    # Left lazy: routine lists never need their items; item details are queried as plain rows.
+    routine_items = relationship("RoutineItem", back_populates="routine", cascade="all, delete-orphan",
+                                 order_by="RoutineItem.id")
     
     def __repr__(self):
         return f"<Routine {self.id}: {self.name}>"
@@ -59,7 +62,8 @@ class RoutineItem(Base):
     
     # Relationships
     routine = relationship("Routine", back_populates="routine_items")
-    item = relationship("Item", back_populates="routine_items")
+    # Every routine item view reads the item's ItemID, so join it in by default
+    item = relationship("Item", back_populates="routine_items", lazy="joined")
     
     __table_args__ = (
         Index('idx_routine_item_order', 'routine_id', 'order'),
@@ -96,9 +100,15 @@ class ChordChart(Base):
     
     __table_args__ = (
         Index('idx_chord_chart_item_order', 'item_id', 'order_col'),
+        # GIN over the split ItemID list, for membership tests on shared charts ("67, 100, 1")
+        Index('idx_chord_charts_item_ids', func.string_to_array(func.replace(item_id, ' ', ''), ','),
+              postgresql_using='gin'),
         # Note: Can't index on JSON properties, but we can add functional indexes later if needed
     )
 
+    # Fetch server defaults (chord_id, created_at) via INSERT ... RETURNING instead of a refresh SELECT
+    __mapper_args__ = {'eager_defaults': True}
+
     def __repr__(self):
         return f"<ChordChart {self.chord_id}: {self.title} (item_id={self.item_id})>"
 
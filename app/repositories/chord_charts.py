@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, update
 from sqlalchemy.orm import joinedload
 from app.models import ChordChart, Item
 from app.repositories.base import BaseRepository
@@ -102,11 +102,9 @@ class ChordChartRepository(BaseRepository):
                 self.db.add(chart)
                 created_charts.append(chart)
             
-            self.db.commit()
-            
-            # Refresh all created charts
-            for chart in created_charts:
-                self.db.refresh(chart)
+            # Flush only: the INSERT ... RETURNING (eager_defaults) fills chord_id and
+            # created_at, so no refresh SELECT is needed. The caller's transaction commits.
+            self.db.flush()
                 
             return created_charts
             
@@ -131,10 +129,22 @@ class ChordChartRepository(BaseRepository):
             self.db.rollback()
             return False
     
-    def update_from_sheets_format(self, chart_id: int, sheets_data: Dict[str, Any]) -> Optional[ChordChart]:
-        """Update chord chart using Sheets format data."""
+    def update_from_sheets_format(self, chart_id: int, sheets_data: Dict[str, Any]) -> Optional[Any]:
+        """Update chord chart using Sheets format data.
+
+        Uses a single UPDATE ... RETURNING; the returned row exposes the same
+        attributes as ChordChart, so it can be passed straight to _to_sheets_format.
+        """
         chart_data = self._from_sheets_format(sheets_data)
-        return self.update(chart_id, **chart_data)
+        stmt = (
+            update(ChordChart)
+            .where(ChordChart.chord_id == chart_id)
+            .values(**chart_data)
+            .returning(ChordChart.chord_id, ChordChart.item_id, ChordChart.title,
+                       ChordChart.chord_data, ChordChart.created_at, ChordChart.order_col)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).first()
     
     def get_sections_for_item(self, item_id: str) -> Dict[str, List[ChordChart]]:
         """Get chord charts grouped by section for an item."""
@@ -149,6 +159,13 @@ class ChordChartRepository(BaseRepository):
             
         return sections
     
+    def get_sections_for_item_sheets_format(self, item_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Get chord charts grouped by section, already converted to Sheets format."""
+        sections = {}
+        for chart in self.get_for_item(item_id):
+            sections.setdefault(chart.section_id or 'default', []).append(self._to_sheets_format(chart))
+        return sections
+    
     def batch_delete(self, chord_ids: List[int]) -> int:
         """Delete multiple chord charts and return count of deleted charts."""
         count = self.db.query(ChordChart).filter(ChordChart.chord_id.in_(chord_ids)).count()
@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, func
 from app.models import CommonChord
 from app.repositories.base import BaseRepository
 import json
@@ -21,39 +21,7 @@ class CommonChordRepository(BaseRepository):
             result = []
             for chord in chords:
                 try:
-                    # Normalize the chord data structure for autocreate compatibility
-                    chord_data = chord.chord_data or {}
-
-                    # Normalize finger data (same as sheets version)
-                    raw_fingers = chord_data.get('fingers', [])
-                    normalized_fingers = []
-
-                    for finger in raw_fingers:
-                        if isinstance(finger, dict):
-                            string_num = finger.get('string')
-                            fret_num = finger.get('fret')
-                            finger_num = finger.get('finger')
-                            if string_num is not None and fret_num is not None:
-                                if finger_num is not None:
-                                    normalized_fingers.append([string_num, fret_num, finger_num])
-                                else:
-                                    normalized_fingers.append([string_num, fret_num])
-                        elif isinstance(finger, list) and len(finger) >= 2:
-                            normalized_fingers.append(finger)
-
-                    result.append({
-                        'title': chord.name,  # Use 'title' for compatibility with sheets format
-                        'fingers': normalized_fingers,
-                        'barres': chord_data.get('barres', []),
-                        'numFrets': chord_data.get('numFrets', 5),
-                        'numStrings': chord_data.get('numStrings', 6),
-                        'tuning': chord_data.get('tuning', 'EADGBE'),
-                        'capo': chord_data.get('capo', 0),
-                        'openStrings': chord_data.get('openStrings', []),
-                        'mutedStrings': chord_data.get('mutedStrings', []),
-                        'startingFret': chord_data.get('startingFret', 1)
-                    })
-
+                    result.append(self._to_autocreate_format(chord))
                 except Exception as e:
                     logging.warning(f"Failed to parse common chord {chord.name}: {str(e)}")
                     continue
@@ -73,8 +41,10 @@ class CommonChordRepository(BaseRepository):
 
     def search_by_name(self, name: str) -> List[CommonChord]:
         """Search for common chords by name (case-insensitive)."""
+        # LOWER(name) LIKE matches the idx_common_chords_name_trgm expression index; ILIKE can't use it
+        pattern = f'%{name.strip()}%'
         return self.db.query(CommonChord).filter(
-            CommonChord.name.ilike(f'%{name.strip()}%')
+            func.lower(CommonChord.name).like(func.lower(pattern))
         ).all()
 
     def get_by_tuning(self, tuning: str = 'EADGBE') -> List[CommonChord]:
@@ -86,4 +56,42 @@ class CommonChordRepository(BaseRepository):
 
     def count_total(self) -> int:
         """Get total count of common chords."""
-        return self.db.query(CommonChord).count()
\ No newline at end of file
+        return self.db.query(CommonChord).count()
+
+    # Format conversion helpers
+    def _to_autocreate_format(self, chord: CommonChord) -> Dict[str, Any]:
+        """Convert a CommonChord to the format expected by autocreate functionality."""
+        chord_data = chord.chord_data or {}
+
+        return {
+            'title': chord.name,  # Use 'title' for compatibility with sheets format
+            'fingers': self._normalize_fingers(chord_data.get('fingers', [])),
+            'barres': chord_data.get('barres', []),
+            'numFrets': chord_data.get('numFrets', 5),
+            'numStrings': chord_data.get('numStrings', 6),
+            'tuning': chord_data.get('tuning', 'EADGBE'),
+            'capo': chord_data.get('capo', 0),
+            'openStrings': chord_data.get('openStrings', []),
+            'mutedStrings': chord_data.get('mutedStrings', []),
+            'startingFret': chord_data.get('startingFret', 1)
+        }
+
+    @staticmethod
+    def _normalize_fingers(raw_fingers: List[Any]) -> List[List[Any]]:
+        """Normalize finger data to [string, fret(, finger)] lists (same as sheets version)."""
+        normalized_fingers = []
+
+        for finger in raw_fingers:
+            if isinstance(finger, dict):
+                string_num = finger.get('string')
+                fret_num = finger.get('fret')
+                finger_num = finger.get('finger')
+                if string_num is not None and fret_num is not None:
+                    if finger_num is not None:
+                        normalized_fingers.append([string_num, fret_num, finger_num])
+                    else:
+                        normalized_fingers.append([string_num, fret_num])
+            elif isinstance(finger, list) and len(finger) >= 2:
+                normalized_fingers.append(finger)
+
+        return normalized_fingers
@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, update, values, column, Integer, String
 from app.models import Item, ChordChart
 from app.repositories.base import BaseRepository
 
@@ -54,13 +54,23 @@ class ItemRepository(BaseRepository):
     def update_order(self, items: List[Dict[str, Any]]) -> bool:
         """Batch update item ordering."""
         try:
-            for item_data in items:
-                # Column A contains the Google Sheets ItemID, not the database primary key
-                sheets_item_id = str(item_data['A'])
-                new_order = int(item_data.get('G', 0)) if item_data.get('G') else 0
-                self.db.query(Item).filter(Item.item_id == sheets_item_id).update({
-                    Item.order: new_order
-                })
+            # Column A contains the Google Sheets ItemID, not the database primary key.
+            # Dict keeps the last order given for a repeated ItemID.
+            new_orders = {
+                str(item_data['A']): int(item_data.get('G', 0)) if item_data.get('G') else 0
+                for item_data in items
+            }
+            if new_orders:
+                # Single UPDATE items ... FROM (VALUES ...) instead of one UPDATE per item
+                order_values = values(
+                    column('item_id', String), column('new_order', Integer), name='new_orders'
+                ).data(list(new_orders.items()))
+                self.db.execute(
+                    update(Item)
+                    .where(Item.item_id == order_values.c.item_id)
+                    .values(order=order_values.c.new_order)
+                    .execution_options(synchronize_session=False)
+                )
             self.db.commit()
             return True
         except Exception:
@@ -77,6 +87,12 @@ class ItemRepository(BaseRepository):
         """Get items filtered by tuning."""
         return self.db.query(Item).filter(Item.tuning == tuning).order_by(Item.title).all()
     
+    def get_tuning_counts(self) -> Dict[str, int]:
+        """Count items per tuning (NULL/empty tunings grouped as 'Unknown')."""
+        tuning = func.coalesce(func.nullif(Item.tuning, ''), 'Unknown')
+        rows = self.db.query(tuning, func.count(Item.id)).group_by(tuning).all()
+        return {tuning_name: count for tuning_name, count in rows}
+    
     def get_with_chord_charts(self, item_id: int) -> Optional[Item]:
         """Get item with chord charts eagerly loaded."""
         return self.db.query(Item).filter(Item.id == item_id).first()
@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, update, values, column, Integer
 from sqlalchemy.orm import joinedload
 from app.models import Routine, RoutineItem, Item, ActiveRoutine
 from app.repositories.base import BaseRepository
@@ -20,6 +20,12 @@ class RoutineRepository(BaseRepository):
         routines = self.get_all_ordered()
         return [self._to_sheets_format(routine) for routine in routines]
     
+    def get_sheets_format_with_active(self) -> List[Dict[str, Any]]:
+        """Get all routines in Sheets format plus an 'active' flag, in a single query."""
+        active_id = self.db.query(ActiveRoutine.routine_id).limit(1).scalar_subquery()
+        rows = self.db.query(Routine, (Routine.id == active_id).label('active')).order_by(Routine.id).all()
+        return [dict(self._to_sheets_format(routine), active=bool(active)) for routine, active in rows]
+    
     def create_from_sheets_format(self, sheets_data: Dict[str, Any]) -> Routine:
         """Create routine from Google Sheets format data, preserving the Sheets ID."""
         routine_data = self._from_sheets_format(sheets_data)
@@ -41,27 +47,29 @@ class RoutineRepository(BaseRepository):
         routine_data = self._from_sheets_format(sheets_data)
         return self.update(routine_id, **routine_data)
     
-    def get_with_items(self, routine_id: int) -> Optional[Routine]:
-        """Get routine with routine items eagerly loaded, preserving physical insertion order."""
-        # Get routine and manually load ordered routine_items to preserve insertion order
-        routine = self.db.query(Routine).filter(Routine.id == routine_id).first()
-        if routine:
-            # Manually load routine_items with explicit ordering by ID (insertion order)
-            # This ensures we get the same order as the original Google Sheets physical rows
-            ordered_routine_items = self.db.query(RoutineItem).options(
-                joinedload(RoutineItem.item)
-            ).filter(RoutineItem.routine_id == routine_id).order_by(RoutineItem.id).all()
-            
-            # Replace the lazy-loaded relationship with our ordered items
-            routine.routine_items = ordered_routine_items
+    def get_routine_items_with_details(self, routine_id: int) -> List[Dict[str, Any]]:
+        """Get routine entries with their item details ({routineEntry, itemDetails}) from a single query."""
+        # CRITICAL: Do NOT sort by order column - preserve physical insertion order from sheets migration
+        rows = self.db.query(
+            RoutineItem.id, RoutineItem.item_id, RoutineItem.order, RoutineItem.completed,
+            Item.id.label('db_item_id'), Item.item_id.label('sheets_item_id'),
+            # Item detail columns C, D, E, F, H, I with NULLs already coalesced in SQL
+            func.coalesce(Item.title, ''), func.coalesce(Item.notes, ''),
+            func.coalesce(Item.duration, ''), func.coalesce(Item.description, ''),
+            func.coalesce(Item.tuning, ''), func.coalesce(Item.songbook, '')
+        ).outerjoin(Item, RoutineItem.item_id == Item.id).filter(
+            RoutineItem.routine_id == routine_id
+        ).order_by(RoutineItem.id).all()
         
-        return routine
+        return [self._routine_item_row_to_structured(row) for row in rows]
     
     def get_routine_items_sheets_format(self, routine_id: int) -> List[Dict[str, Any]]:
         """Get routine items in Sheets format, preserving physical insertion order."""
         # CRITICAL: Do NOT sort by order column - preserve physical insertion order from sheets migration
         # The order column contains drag-and-drop values with gaps and is for display logic only
-        routine_items = self.db.query(RoutineItem).filter(
+        routine_items = self.db.query(RoutineItem).options(
+            joinedload(RoutineItem.item).load_only(Item.item_id)
+        ).filter(
             RoutineItem.routine_id == routine_id
         ).order_by(RoutineItem.id).all()
         
@@ -132,18 +140,24 @@ class RoutineRepository(BaseRepository):
     def update_routine_items_order(self, routine_id: int, items: List[Dict[str, Any]]) -> bool:
         """Update routine item ordering."""
         try:
+            # RoutineItem ID (Column A) -> Order (Column C)
+            new_orders = {
+                int(item_data['A']): int(item_data.get('C', 0))
+                for item_data in items if item_data.get('A')
+            }
             updated_count = 0
-            for item_data in items:
-                routine_item_id = item_data.get('A')  # RoutineItem ID
-                new_order = item_data.get('C', 0)  # Order
-
-                if routine_item_id:
-                    result = self.db.query(RoutineItem).filter(
-                        and_(RoutineItem.id == int(routine_item_id),
-                             RoutineItem.routine_id == routine_id)
-                    ).update({RoutineItem.order: int(new_order)})
-                    updated_count += result
-                    logging.debug(f"Updated routine item {routine_item_id} (routine {routine_id}) order to {new_order}: {result} rows affected")
+            if new_orders:
+                # Single UPDATE routine_items ... FROM (VALUES ...) instead of one UPDATE per item
+                order_values = values(
+                    column('id', Integer), column('new_order', Integer), name='new_orders'
+                ).data(list(new_orders.items()))
+                updated_count = self.db.execute(
+                    update(RoutineItem)
+                    .where(and_(RoutineItem.id == order_values.c.id,
+                                RoutineItem.routine_id == routine_id))
+                    .values(order=order_values.c.new_order)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
 
             self.db.commit()
             logging.info(f"Successfully updated {updated_count} routine item orders out of {len(items)} requested for routine {routine_id}")
@@ -156,17 +170,23 @@ class RoutineRepository(BaseRepository):
     def update_routines_order(self, routines: List[Dict[str, Any]]) -> bool:
         """Update the order of routines in the routines list."""
         try:
+            # Routine ID (Column A) -> Order (Column D)
+            new_orders = {
+                int(routine_data['A']): int(routine_data.get('D', 0))
+                for routine_data in routines if routine_data.get('A')
+            }
             updated_count = 0
-            for routine_data in routines:
-                routine_id = routine_data.get('A')  # Routine ID
-                new_order = routine_data.get('D', 0)  # Order (Column D)
-
-                if routine_id:
-                    result = self.db.query(Routine).filter(
-                        Routine.id == int(routine_id)
-                    ).update({Routine.order: int(new_order)})
-                    updated_count += result
-                    logging.debug(f"Updated routine {routine_id} order to {new_order}: {result} rows affected")
+            if new_orders:
+                # Single UPDATE routines ... FROM (VALUES ...) instead of one UPDATE per routine
+                order_values = values(
+                    column('id', Integer), column('new_order', Integer), name='new_orders'
+                ).data(list(new_orders.items()))
+                updated_count = self.db.execute(
+                    update(Routine)
+                    .where(Routine.id == order_values.c.id)
+                    .values(order=order_values.c.new_order)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
 
             self.db.commit()
             logging.info(f"Successfully updated {updated_count} routine orders out of {len(routines)} requested")
@@ -252,8 +272,8 @@ class RoutineRepository(BaseRepository):
         # CRITICAL: Column B must contain the Google Sheets ItemID (items.item_id),
         # NOT the database primary key (routine_items.item_id)
 
-        # Get the actual ItemID string from the Items table
-        item = self.db.query(Item).filter(Item.id == routine_item.item_id).first()
+        # Get the actual ItemID string via the relationship (eager-loaded by callers, so no per-row query)
+        item = routine_item.item
         item_id_str = item.item_id if item and item.item_id else str(routine_item.item_id)
 
         return {
@@ -263,6 +283,27 @@ class RoutineRepository(BaseRepository):
             'D': 'TRUE' if routine_item.completed else 'FALSE'  # Completed
         }
 
+    _ITEM_DETAIL_COLUMNS = ('C', 'D', 'E', 'F', 'H', 'I')
+
+    def _routine_item_row_to_structured(self, row) -> Dict[str, Any]:
+        """Convert a get_routine_items_with_details row to {routineEntry, itemDetails} format."""
+        structured_item = {
+            'routineEntry': {
+                'A': str(row.id),  # RoutineItem ID
+                'B': row.sheets_item_id or str(row.item_id),  # Google Sheets ItemID
+                'C': str(row.order),  # Order
+                'D': 'TRUE' if row.completed else 'FALSE'  # Completed
+            }
+        }
+        if row.db_item_id is not None:
+            item_details = {
+                'A': str(row.sheets_item_id),  # Use item_id (Google Sheets ItemID) for API consistency
+                'B': str(row.sheets_item_id)  # Column B is also ItemID for consistency
+            }
+            item_details.update(zip(self._ITEM_DETAIL_COLUMNS, row[6:]))
+            structured_item['itemDetails'] = item_details
+        return structured_item
+
 class ActiveRoutineRepository(BaseRepository):
     def __init__(self, db_session=None):
         super().__init__(ActiveRoutine, db_session)
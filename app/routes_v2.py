@@ -938,7 +938,10 @@ def get_active_routine_alt():
 @app.route('/api/dev/clear-cache', methods=['POST'])
 def clear_cache():
     """Clear any caches (useful during development)"""
-    # For now, just return success
+    from app.services.common_chords import invalidate_common_chords_cache
+    from app.services.chord_charts import invalidate_chart_stats_cache
+    invalidate_common_chords_cache()
+    invalidate_chart_stats_cache()
     return jsonify({"success": True, "message": "Cache cleared"})
 
 @app.route('/api/dev/migrate-test', methods=['POST'])
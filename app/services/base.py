@@ -1,19 +1,46 @@
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Any, Optional
-from app.database import DatabaseTransaction
+from app.database import DatabaseTransaction, ReadOnlyTransaction
 
 class BaseService(ABC):
     """Base service class with transaction management."""
     
+    _session_cached_names = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """Record the cached_property names (e.g. repositories) once per class, not per call."""
+        super().__init_subclass__(**kwargs)
+        cls._session_cached_names = tuple({
+            name
+            for klass in cls.__mro__
+            for name, attr in vars(klass).items()
+            if isinstance(attr, cached_property)
+        })
+
     def __init__(self):
         self.db = None
     
     def _execute_with_transaction(self, func, *args, **kwargs):
         """Execute a function within a database transaction."""
-        with DatabaseTransaction() as db:
+        return self._execute_in_session(DatabaseTransaction(), func, *args, **kwargs)
+
+    def _execute_readonly(self, func, *args, **kwargs):
+        """Execute a read-only function on an autocommit session (no BEGIN/COMMIT round-trips)."""
+        return self._execute_in_session(ReadOnlyTransaction(), func, *args, **kwargs)
+
+    def _execute_in_session(self, session_context, func, *args, **kwargs):
+        """Bind self.db to the session from session_context for the duration of func."""
+        with session_context as db:
             self.db = db
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                self.db = None
\ No newline at end of file
+                self.db = None
+                self._clear_session_cache()
+
+    def _clear_session_cache(self):
+        """Drop cached_property values (e.g. repositories) bound to the closed session."""
+        for name in self._session_cached_names:
+            self.__dict__.pop(name, None)
@@ -1,53 +1,82 @@
-from typing import List, Dict, Any, Optional
+from functools import cached_property
+from typing import List, Dict, Any, Optional, Tuple
 from app.services.base import BaseService
 from app.repositories.chord_charts import ChordChartRepository
-from app.repositories.items import ItemRepository
 from app.models import ChordChart
 import logging
+import threading
+import time
+
+# get_chart_stats feeds dashboard-style counters. They are cached so repeated reads
+# don't re-split every chart's ItemID list; every chart/item write drops the cache.
+CHART_STATS_TTL_SECONDS = 60
+_chart_stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_chart_stats_generation = 0  # Bumped on invalidation, so a read racing a write isn't cached
+_chart_stats_lock = threading.Lock()
+
+def invalidate_chart_stats_cache():
+    """Drop the cached chord chart statistics so the next call recomputes them."""
+    global _chart_stats_cache, _chart_stats_generation
+    with _chart_stats_lock:
+        _chart_stats_cache = None
+        _chart_stats_generation += 1
 
 class ChordChartService(BaseService):
+    def _execute_and_invalidate_stats(self, func):
+        """Run a mutating operation in a transaction, then drop the cached chart statistics."""
+        result = self._execute_with_transaction(func)
+        invalidate_chart_stats_cache()
+        return result
+
+    @cached_property
+    def repo(self) -> ChordChartRepository:
+        """Repository bound to the current transaction's session (cleared when it closes)."""
+        return ChordChartRepository(self.db)
+
     def get_for_item(self, item_id: str) -> List[Dict[str, Any]]:
         """Get chord charts for an item in Sheets format."""
         def _get_charts():
-            repo = ChordChartRepository(self.db)
-            return repo.get_for_item_sheets_format(item_id)
+            return self.repo.get_for_item_sheets_format(item_id)
         
-        return self._execute_with_transaction(_get_charts)
+        return self._execute_readonly(_get_charts)
     
     def create_chord_chart(self, item_id: str, chart_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a single chord chart."""
         def _create_chart():
-            repo = ChordChartRepository(self.db)
-            charts = repo.batch_create(item_id, [chart_data])
-            return repo._to_sheets_format(charts[0]) if charts else {}
+            charts = self.repo.batch_create(item_id, [chart_data])
+            return self.repo._to_sheets_format(charts[0]) if charts else {}
         
-        return self._execute_with_transaction(_create_chart)
+        return self._execute_and_invalidate_stats(_create_chart)
     
     def batch_create(self, item_id: str, chord_charts_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Create multiple chord charts in a single transaction."""
         def _batch_create():
-            repo = ChordChartRepository(self.db)
-            charts = repo.batch_create(item_id, chord_charts_data)
-            return [repo._to_sheets_format(chart) for chart in charts]
+            charts = self.repo.batch_create(item_id, chord_charts_data)
+            return [self.repo._to_sheets_format(chart) for chart in charts]
         
-        return self._execute_with_transaction(_batch_create)
+        return self._execute_and_invalidate_stats(_batch_create)
     
     def update_chord_chart(self, chart_id: int, chart_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a chord chart with Sheets format data."""
         def _update_chart():
-            repo = ChordChartRepository(self.db)
-            chart = repo.update_from_sheets_format(chart_id, chart_data)
-            return repo._to_sheets_format(chart) if chart else None
+            chart = self.repo.update_from_sheets_format(chart_id, chart_data)
+            return self.repo._to_sheets_format(chart) if chart else None
         
-        return self._execute_with_transaction(_update_chart)
+        return self._execute_and_invalidate_stats(_update_chart)
     
     def delete_chord_chart(self, chart_id: int) -> bool:
         """Delete a single chord chart."""
         def _delete_chart():
-            repo = ChordChartRepository(self.db)
-            return repo.delete(chart_id)
+            return self.repo.delete(chart_id)
+
+        return self._execute_and_invalidate_stats(_delete_chart)
+
+    def batch_delete(self, chart_ids: List[int]) -> int:
+        """Delete multiple chord charts by ID in a single transaction."""
+        def _batch_delete():
+            return self.repo.batch_delete(chart_ids)
 
-        return self._execute_with_transaction(_delete_chart)
+        return self._execute_and_invalidate_stats(_batch_delete)
 
     def delete_chord_chart_from_item(self, item_id: str, chart_id: int) -> bool:
         """Delete a chord chart from a specific item (handles comma-separated sharing properly)"""
@@ -91,53 +120,53 @@ class ChordChartService(BaseService):
                 })
                 logging.info(f"Removed item {item_id} from shared chord chart {chart_id}, now shared by: {new_item_ids_str}")
 
-            self.db.commit()
             return True
 
-        return self._execute_with_transaction(_delete_chart_from_item)
+        return self._execute_and_invalidate_stats(_delete_chart_from_item)
     
     def update_order(self, item_id: str, chord_charts: List[Dict[str, Any]]) -> bool:
         """Update chord chart ordering for an item."""
         def _update_order():
-            repo = ChordChartRepository(self.db)
-            return repo.update_order(item_id, chord_charts)
+            return self.repo.update_order(item_id, chord_charts)
         
         return self._execute_with_transaction(_update_order)
     
     def get_sections_for_item(self, item_id: str) -> Dict[str, List[Dict[str, Any]]]:
         """Get chord charts grouped by section for an item."""
         def _get_sections():
-            repo = ChordChartRepository(self.db)
-            sections = repo.get_sections_for_item(item_id)
-            
-            # Convert to Sheets format
-            result = {}
-            for section_id, charts in sections.items():
-                result[section_id] = [repo._to_sheets_format(chart) for chart in charts]
-            
-            return result
+            return self.repo.get_sections_for_item_sheets_format(item_id)
         
-        return self._execute_with_transaction(_get_sections)
+        return self._execute_readonly(_get_sections)
     
     def delete_all_for_item(self, item_id: str) -> int:
         """Delete all chord charts for an item."""
         def _delete_all():
-            repo = ChordChartRepository(self.db)
-            return repo.delete_all_for_item(item_id)
+            return self.repo.delete_all_for_item(item_id)
         
-        return self._execute_with_transaction(_delete_all)
+        return self._execute_and_invalidate_stats(_delete_all)
     
     def get_chart_stats(self) -> Dict[str, Any]:
-        """Get statistics about chord charts."""
+        """Get statistics about chord charts (cached for CHART_STATS_TTL_SECONDS)."""
+        global _chart_stats_cache
+        cached = _chart_stats_cache
+        if cached is not None and time.monotonic() - cached[0] < CHART_STATS_TTL_SECONDS:
+            return dict(cached[1])
+        generation = _chart_stats_generation
+
         def _get_stats():
-            repo = ChordChartRepository(self.db)
-            item_repo = ItemRepository(self.db)
-            
-            total_charts = repo.count()
-            total_items = item_repo.count()
-            
-            # Get items with and without charts
-            items_with_charts = self.db.query(ChordChart.item_id).distinct().count()
+            from sqlalchemy import text
+
+            # Single round-trip for all counts. Shared charts store comma-separated
+            # ItemIDs ("67, 100, 1"), so split them before counting distinct items.
+            total_charts, total_items, items_with_charts = self.db.execute(text('''
+                SELECT
+                    (SELECT COUNT(*) FROM chord_charts),
+                    (SELECT COUNT(*) FROM items),
+                    (SELECT COUNT(DISTINCT trim(ids.item_id))
+                     FROM chord_charts, unnest(string_to_array(chord_charts.item_id, ',')) AS ids(item_id)
+                     WHERE trim(ids.item_id) <> '')
+            ''')).fetchone()
+
             items_without_charts = total_items - items_with_charts
             
             return {
@@ -147,7 +176,11 @@ class ChordChartService(BaseService):
                 'avg_charts_per_item': total_charts / total_items if total_items > 0 else 0
             }
         
-        return self._execute_with_transaction(_get_stats)
+        stats = self._execute_readonly(_get_stats)
+        with _chart_stats_lock:
+            if generation == _chart_stats_generation:
+                _chart_stats_cache = (time.monotonic(), stats)
+        return dict(stats)
     
     def copy_chord_charts_to_items(self, source_item_id: str, target_item_ids: List[str]) -> Dict[str, Any]:
         """Copy chord charts from source item to multiple target items using sharing model (PostgreSQL version)."""
@@ -157,88 +190,70 @@ class ChordChartService(BaseService):
             source_item_id_str = str(source_item_id)
             target_item_ids_str = [str(tid) for tid in target_item_ids]
 
-            # Step 1: Find all chord charts that belong to the source item (using comma-separated matching)
-            source_charts = []
-            result = self.db.execute(text('''
-                SELECT chord_id, item_id, title, chord_data, created_at, order_col
+            # Step 1: One SELECT finds the source's charts and every chart a target already has.
+            # Overlap on the split ItemID list ("100, 92, 45" -> {100,92,45}) uses idx_chord_charts_item_ids
+            matched_charts = self.db.execute(text('''
+                SELECT chord_id, item_id
                 FROM chord_charts
-                WHERE item_id = :exact_id
-                   OR item_id LIKE :pattern1
-                   OR item_id LIKE :pattern2
-                   OR item_id LIKE :pattern3
+                WHERE string_to_array(replace(item_id, ' ', ''), ',') && CAST(:item_ids AS text[])
                 ORDER BY order_col
-            '''), {
-                'exact_id': source_item_id_str,
-                'pattern1': f'{source_item_id_str},%',      # "92, 100"
-                'pattern2': f'%, {source_item_id_str}',      # "100, 92"
-                'pattern3': f'%, {source_item_id_str},%'     # "100, 92, 45"
-            }).fetchall()
+            '''), {'item_ids': [source_item_id_str] + target_item_ids_str}).fetchall()
+
+            # Partition in Python: charts containing the source vs. charts only the targets share
+            result = []
+            target_charts = []
+            for chart_id, current_item_ids_str in matched_charts:
+                item_ids = [id.strip() for id in current_item_ids_str.split(',') if id.strip()]
+                if source_item_id_str in item_ids:
+                    result.append((chart_id, item_ids))
+                else:
+                    target_charts.append((chart_id, item_ids))
 
             if not result:
                 logging.warning(f"No chord charts found for source item {source_item_id}")
                 return {'updated': 0, 'removed': 0, 'charts_found': 0, 'target_items': target_item_ids}
 
-            updated_count = 0
-            removed_count = 0
-
             # Step 2: Remove existing chord charts from target items (source wins - same as sheets version)
-            for target_id in target_item_ids_str:
-                logging.info(f"Removing existing chord charts for target item {target_id} before copying")
-
-                # Find charts that contain the target item ID
-                target_charts = self.db.execute(text('''
-                    SELECT chord_id, item_id FROM chord_charts
-                    WHERE item_id = :exact_id
-                       OR item_id LIKE :pattern1
-                       OR item_id LIKE :pattern2
-                       OR item_id LIKE :pattern3
-                '''), {
-                    'exact_id': target_id,
-                    'pattern1': f'{target_id},%',
-                    'pattern2': f'%, {target_id}',
-                    'pattern3': f'%, {target_id},%'
-                }).fetchall()
-
-                for chart_row in target_charts:
-                    chart_id, current_item_ids_str = chart_row
-                    item_ids = [id.strip() for id in current_item_ids_str.split(',') if id.strip()]
-
-                    if target_id in item_ids:
-                        if len(item_ids) == 1:
-                            # Chart belongs only to target - remove entirely
-                            self.db.execute(text('DELETE FROM chord_charts WHERE chord_id = :chart_id'), {'chart_id': chart_id})
-                            removed_count += 1
-                            logging.info(f"Removed chart {chart_id} that belonged only to item {target_id}")
-                        else:
-                            # Chart is shared - remove target from the list
-                            item_ids.remove(target_id)
-                            new_item_ids_str = ', '.join(item_ids)
-                            self.db.execute(text('UPDATE chord_charts SET item_id = :new_item_ids WHERE chord_id = :chart_id'), {
-                                'new_item_ids': new_item_ids_str,
-                                'chart_id': chart_id
-                            })
-                            logging.info(f"Removed item {target_id} from shared chart {chart_id}")
+            target_set = set(target_item_ids_str)
+            charts_to_delete = []
+            chart_updates = []
+            for chart_id, item_ids in target_charts:
+                remaining_ids = [id for id in item_ids if id not in target_set]
+                if not remaining_ids:
+                    # Chart belongs only to targets - remove entirely
+                    charts_to_delete.append(chart_id)
+                    logging.info(f"Removed chart {chart_id} that belonged only to target items")
+                else:
+                    # Chart is shared - remove targets from the list
+                    chart_updates.append({
+                        'new_item_ids': ', '.join(remaining_ids),
+                        'chart_id': chart_id
+                    })
+                    logging.info(f"Removed target items from shared chart {chart_id}")
 
             # Step 3: Add target item IDs to source charts (sharing model - same as sheets version)
-            for chart_row in result:
-                chart_id, current_item_ids_str = chart_row[0], chart_row[1]
-                current_item_ids = [id.strip() for id in current_item_ids_str.split(',') if id.strip()]
-
+            # De-duplicated targets in request order, so each chart needs only hash lookups
+            unique_target_ids = list(dict.fromkeys(target_item_ids_str))
+            for chart_id, current_item_ids in result:
                 # Add target item IDs if they're not already present
-                for target_id in target_item_ids_str:
-                    if target_id not in current_item_ids:
-                        current_item_ids.append(target_id)
-                        logging.info(f"Added item {target_id} to chart {chart_id}")
+                current_set = set(current_item_ids)
+                additions = [t for t in unique_target_ids if t not in current_set]
+                if additions:
+                    logging.info(f"Added items {', '.join(additions)} to chart {chart_id}")
 
                 # Update the ItemID column with comma-separated list
-                new_item_ids_str = ', '.join(current_item_ids)
-                self.db.execute(text('UPDATE chord_charts SET item_id = :new_item_ids WHERE chord_id = :chart_id'), {
-                    'new_item_ids': new_item_ids_str,
+                chart_updates.append({
+                    'new_item_ids': ', '.join(current_item_ids + additions),
                     'chart_id': chart_id
                 })
-                updated_count += 1
 
-            self.db.commit()
+            # Apply everything as one DELETE plus one executemany UPDATE
+            if charts_to_delete:
+                self.db.execute(text('DELETE FROM chord_charts WHERE chord_id = ANY(:chart_ids)'), {'chart_ids': charts_to_delete})
+            self.db.execute(text('UPDATE chord_charts SET item_id = :new_item_ids WHERE chord_id = :chart_id'), chart_updates)
+
+            updated_count = len(result)
+            removed_count = len(charts_to_delete)
 
             logging.info(f"Successfully copied {len(result)} chord charts from item {source_item_id} to {len(target_item_ids)} items: {updated_count} charts updated, {removed_count} existing charts removed")
 
@@ -249,4 +264,4 @@ class ChordChartService(BaseService):
                 'target_items': target_item_ids
             }
 
-        return self._execute_with_transaction(_copy_charts)
\ No newline at end of file
+        return self._execute_and_invalidate_stats(_copy_charts)
\ No newline at end of file
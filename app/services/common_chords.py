@@ -2,73 +2,85 @@ from typing import List, Dict, Any, Optional
 from app.services.base import BaseService
 from app.repositories.common_chords import CommonChordRepository
 import logging
+import threading
 
-class CommonChordService(BaseService):
-    def get_all_for_autocreate(self) -> List[Dict[str, Any]]:
-        """Get all common chords in autocreate-compatible format."""
-        def _get_chords():
-            repo = CommonChordRepository(self.db)
-            return repo.get_all_for_autocreate()
+# In-process copy of the common_chords reference table, loaded on first use.
+# The app never writes common chords, so it only needs reloading after a manual
+# data load (see invalidate_common_chords_cache / POST /api/dev/clear-cache).
+_catalog: Optional[Dict[str, Any]] = None
+_catalog_lock = threading.Lock()
 
-        return self._execute_with_transaction(_get_chords)
+def invalidate_common_chords_cache():
+    """Drop the in-process common chords catalog so the next call reloads it."""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
 
-    def find_chord_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        """Find a specific chord by name and return in autocreate format."""
-        def _find_chord():
-            repo = CommonChordRepository(self.db)
-            chord = repo.find_by_name(name)
+class CommonChordService(BaseService):
+    def _get_catalog(self) -> Dict[str, Any]:
+        """Return the common chords catalog, loading it from PostgreSQL if needed."""
+        global _catalog
+        catalog = _catalog
+        if catalog is not None:
+            return catalog
 
-            if not chord or not chord.chord_data:
-                return None
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = self._execute_readonly(self._load_catalog)
+            return _catalog
 
-            # Convert to autocreate format (same structure as get_all_for_autocreate)
-            chord_data = chord.chord_data or {}
+    def _load_catalog(self) -> Dict[str, Any]:
+        """Build the catalog structures from a single scan of common_chords."""
+        repo = CommonChordRepository(self.db)
+        chords = repo.get_all()
 
-            # Normalize finger data
-            raw_fingers = chord_data.get('fingers', [])
-            normalized_fingers = []
+        by_name = {}
+        autocreate = []
+        search_entries = []
+        for chord in sorted(chords, key=lambda c: c.id):
+            if chord.name is None:
+                continue
+            search_entries.append((chord.name.lower(), chord.name, chord.id))
+            autocreate_chord = None
+            if chord.chord_data is not None:
+                try:
+                    autocreate_chord = repo._to_autocreate_format(chord)
+                    autocreate.append(autocreate_chord)
+                except Exception as e:
+                    logging.warning(f"Failed to parse common chord {chord.name}: {str(e)}")
+            # First row per name wins, like find_by_name; it resolves to None when it has no chord data
+            by_name.setdefault(chord.name, autocreate_chord if chord.chord_data else None)
 
-            for finger in raw_fingers:
-                if isinstance(finger, dict):
-                    string_num = finger.get('string')
-                    fret_num = finger.get('fret')
-                    finger_num = finger.get('finger')
-                    if string_num is not None and fret_num is not None:
-                        if finger_num is not None:
-                            normalized_fingers.append([string_num, fret_num, finger_num])
-                        else:
-                            normalized_fingers.append([string_num, fret_num])
-                elif isinstance(finger, list) and len(finger) >= 2:
-                    normalized_fingers.append(finger)
+        logging.info(f"Loaded {len(autocreate)} common chords into the in-process catalog")
+        return {
+            'count': len(chords),
+            'by_name': by_name,
+            'autocreate': autocreate,
+            'search_entries': search_entries,
+        }
 
-            return {
-                'title': chord.name,
-                'fingers': normalized_fingers,
-                'barres': chord_data.get('barres', []),
-                'numFrets': chord_data.get('numFrets', 5),
-                'numStrings': chord_data.get('numStrings', 6),
-                'tuning': chord_data.get('tuning', 'EADGBE'),
-                'capo': chord_data.get('capo', 0),
-                'openStrings': chord_data.get('openStrings', []),
-                'mutedStrings': chord_data.get('mutedStrings', []),
-                'startingFret': chord_data.get('startingFret', 1)
-            }
+    def get_all_for_autocreate(self) -> List[Dict[str, Any]]:
+        """Get all common chords in autocreate-compatible format."""
+        try:
+            return list(self._get_catalog()['autocreate'])
+        except Exception as e:
+            logging.error(f"Error in get_all_for_autocreate: {str(e)}")
+            return []
 
-        return self._execute_with_transaction(_find_chord)
+    def find_chord_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Find a specific chord by name and return in autocreate format."""
+        chord = self._get_catalog()['by_name'].get(name.strip())
+        return dict(chord) if chord else None
 
     def search_chords_by_name(self, name: str) -> List[Dict[str, Any]]:
-        """Search for chords by name pattern."""
-        def _search_chords():
-            repo = CommonChordRepository(self.db)
-            chords = repo.search_by_name(name)
-            return [{'name': chord.name, 'id': chord.id} for chord in chords]
-
-        return self._execute_with_transaction(_search_chords)
+        """Search for chords by name pattern (case-insensitive substring match)."""
+        needle = name.strip().lower()
+        return [
+            {'name': chord_name, 'id': chord_id}
+            for name_lower, chord_name, chord_id in self._get_catalog()['search_entries']
+            if needle in name_lower
+        ]
 
     def get_chord_count(self) -> int:
         """Get total count of available common chords."""
-        def _get_count():
-            repo = CommonChordRepository(self.db)
-            return repo.count_total()
-
-        return self._execute_with_transaction(_get_count)
\ No newline at end of file
+        return self._get_catalog()['count']
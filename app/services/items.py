@@ -1,8 +1,9 @@
 from typing import List, Dict, Any, Optional
+from sqlalchemy import delete, update
 from app.services.base import BaseService
 from app.repositories.items import ItemRepository
-from app.repositories.chord_charts import ChordChartRepository
-from app.models import Item
+from app.services.chord_charts import invalidate_chart_stats_cache
+from app.models import Item, ChordChart, RoutineItem
 import logging
 
 class ItemService(BaseService):
@@ -12,7 +13,7 @@ class ItemService(BaseService):
             repo = ItemRepository(self.db)
             return repo.get_sheets_format()
         
-        return self._execute_with_transaction(_get_items)
+        return self._execute_readonly(_get_items)
     
     def get_item(self, item_id: int) -> Optional[Dict[str, Any]]:
         """Get a single item by ID in Sheets format."""
@@ -21,7 +22,7 @@ class ItemService(BaseService):
             item = repo.get_by_id(item_id)
             return repo._to_sheets_format(item) if item else None
         
-        return self._execute_with_transaction(_get_item)
+        return self._execute_readonly(_get_item)
     
     def create_item(self, item_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new item from Sheets format data."""
@@ -30,7 +31,9 @@ class ItemService(BaseService):
             item = repo.create_from_sheets_format(item_data)
             return repo._to_sheets_format(item)
         
-        return self._execute_with_transaction(_create_item)
+        item = self._execute_with_transaction(_create_item)
+        invalidate_chart_stats_cache()  # Item count changed
+        return item
     
     def update_item(self, item_id: int, item_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update an existing item with Sheets format data."""
@@ -44,22 +47,27 @@ class ItemService(BaseService):
     def delete_item(self, item_id: int) -> bool:
         """Delete an item and all associated chord charts."""
         def _delete_item():
-            item_repo = ItemRepository(self.db)
-            chord_repo = ChordChartRepository(self.db)
+            # Set-based DELETEs only - no SELECT probe, no ORM hydration of the item
+            # or its routine entries. routine_items is cleared explicitly because its
+            # FK to items has no ON DELETE CASCADE.
+            self.db.execute(delete(RoutineItem).where(RoutineItem.item_id == item_id))
             
-            # Get the item to extract its ItemID string
-            item = item_repo.get_by_id(item_id)
-            if not item:
+            # Delete the item, getting its ItemID string back in the same statement
+            deleted = self.db.execute(
+                delete(Item).where(Item.id == item_id).returning(Item.item_id)
+            ).first()
+            if not deleted:
                 return False
                 
-            # Delete associated chord charts first using ItemID string
-            if item.item_id:
-                chord_repo.delete_all_for_item(item.item_id)
+            # Delete associated chord charts using ItemID string
+            if deleted.item_id:
+                self.db.execute(delete(ChordChart).where(ChordChart.item_id == deleted.item_id))
             
-            # Delete the item
-            return item_repo.delete(item_id)
+            return True
         
-        return self._execute_with_transaction(_delete_item)
+        deleted = self._execute_with_transaction(_delete_item)
+        invalidate_chart_stats_cache()  # Item and chord chart counts changed
+        return deleted
     
     def update_items_order(self, items: List[Dict[str, Any]]) -> bool:
         """Update item ordering (drag-and-drop support)."""
@@ -76,7 +84,7 @@ class ItemService(BaseService):
             items = repo.search_by_title(search_term)
             return [repo._to_sheets_format(item) for item in items]
         
-        return self._execute_with_transaction(_search_items)
+        return self._execute_readonly(_search_items)
     
     def get_items_by_tuning(self, tuning: str) -> List[Dict[str, Any]]:
         """Get items filtered by tuning."""
@@ -85,27 +93,23 @@ class ItemService(BaseService):
             items = repo.get_by_tuning(tuning)
             return [repo._to_sheets_format(item) for item in items]
         
-        return self._execute_with_transaction(_get_by_tuning)
+        return self._execute_readonly(_get_by_tuning)
     
     def get_item_stats(self) -> Dict[str, Any]:
         """Get statistics about items."""
         def _get_stats():
             repo = ItemRepository(self.db)
-            total_items = repo.count()
             
-            # Get tuning distribution
-            items = repo.get_all_ordered()
-            tunings = {}
-            for item in items:
-                tuning = item.tuning or 'Unknown'
-                tunings[tuning] = tunings.get(tuning, 0) + 1
+            # Tuning distribution aggregated in SQL; every item falls in exactly one bucket
+            tunings = repo.get_tuning_counts()
+            total_items = sum(tunings.values())
             
             return {
                 'total_items': total_items,
                 'tuning_distribution': tunings
             }
         
-        return self._execute_with_transaction(_get_stats)
+        return self._execute_readonly(_get_stats)
     
     def get_item_by_id(self, item_id: int) -> Optional[Dict[str, Any]]:
         """Get a single item by database ID in Sheets format."""
@@ -114,14 +118,11 @@ class ItemService(BaseService):
     def update_item_notes(self, item_id: int, notes: str) -> bool:
         """Update notes for a specific item."""
         def _update_notes():
-            repo = ItemRepository(self.db)
-            item = repo.get_by_id(item_id)
-            if not item:
-                return False
-            
-            # Update the notes field
-            item.notes = notes
-            repo.db.commit()
-            return True
+            # Single targeted UPDATE (no SELECT/hydration); the wrapper commits
+            result = self.db.execute(
+                update(Item).where(Item.id == item_id).values(notes=notes)
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount > 0
         
         return self._execute_with_transaction(_update_notes)
\ No newline at end of file
@@ -3,6 +3,8 @@ from app.services.base import BaseService
 from app.repositories.routines import RoutineRepository, ActiveRoutineRepository
 from app.models import Routine, RoutineItem
 import logging
+import threading
+from werkzeug.local import LocalProxy
 
 logger = logging.getLogger(__name__)
 
@@ -13,30 +15,20 @@ class RoutineService(BaseService):
         """Get all routines in Sheets format with active status."""
         def _get_routines():
             routine_repo = RoutineRepository(self.db)
-            active_repo = ActiveRoutineRepository(self.db)
-            
-            # Get raw sheets format data
-            routines_raw = routine_repo.get_sheets_format()
-            
-            # Get active routine ID
-            active_routine_data = active_repo.get_active_routine()
-            active_id = active_routine_data.get('A') if active_routine_data else None
             
-            # Transform to include proper field names and active status
-            routines = []
-            for record in routines_raw:
-                routine = {
+            # Routines plus active flag computed in SQL (one query)
+            return [
+                {
                     'ID': record['A'],  # Column A for ID
                     'name': record['B'],  # Column B for name
                     'created': record['C'],  # Column C for created date
                     'order': record['D'],  # Column D for order
-                    'active': record['A'] == active_id if active_id else False  # Compare IDs
+                    'active': record['active']
                 }
-                routines.append(routine)
-            
-            return routines
+                for record in routine_repo.get_sheets_format_with_active()
+            ]
         
-        return self._execute_with_transaction(_get_routines)
+        return self._execute_readonly(_get_routines)
     
     def create_routine(self, routine_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new routine from Sheets format data."""
@@ -68,45 +60,19 @@ class RoutineService(BaseService):
         """Get routine with all its items and their details."""
         def _get_routine_with_items():
             routine_repo = RoutineRepository(self.db)
-            routine = routine_repo.get_with_items(routine_id)
+            routine = routine_repo.get_by_id(routine_id)
             if routine:
                 # Convert to Sheets format
                 routine_data = routine_repo._to_sheets_format(routine)
                 
-                # Build items list with both routine item data and item details
+                # Items structured to match frontend expectations: {routineEntry: {...}, itemDetails: {...}}
                 # CRITICAL: Do NOT sort by order column - preserve physical insertion order from sheets migration
                 # The order column contains drag-and-drop values with gaps and is for display logic only
-                items = []
-                for routine_item in routine.routine_items:
-                    # Create routine item in sheets format
-                    routine_item_data = routine_repo._routine_item_to_sheets_format(routine_item)
-
-                    # Structure the data to match frontend expectations: {routineEntry: {...}, itemDetails: {...}}
-                    structured_item = {
-                        'routineEntry': routine_item_data
-                    }
-
-                    # Add item details if available
-                    if routine_item.item:
-                        structured_item['itemDetails'] = {
-                            'A': str(routine_item.item.item_id),  # Use item_id (Google Sheets ItemID) for API consistency
-                            'B': str(routine_item.item.item_id),  # Column B is also ItemID for consistency
-                            'C': routine_item.item.title or '',
-                            'D': routine_item.item.notes or '',
-                            'E': routine_item.item.duration or '',
-                            'F': routine_item.item.description or '',
-                            'H': routine_item.item.tuning or '',
-                            'I': routine_item.item.songbook or ''
-                        }
-
-                    items.append(structured_item)
-                
-                # Items now preserve physical insertion order (no sorting applied)
-                routine_data['items'] = items
+                routine_data['items'] = routine_repo.get_routine_items_with_details(routine_id)
                 return routine_data
             return None
         
-        return self._execute_with_transaction(_get_routine_with_items)
+        return self._execute_readonly(_get_routine_with_items)
     
     def get_routine_items(self, routine_id: int) -> List[Dict[str, Any]]:
         """Get routine items in Sheets format."""
@@ -114,7 +80,7 @@ class RoutineService(BaseService):
             routine_repo = RoutineRepository(self.db)
             return routine_repo.get_routine_items_sheets_format(routine_id)
         
-        return self._execute_with_transaction(_get_routine_items)
+        return self._execute_readonly(_get_routine_items)
     
     def add_item_to_routine(self, routine_id: int, item_id: int, order: int = None) -> Dict[str, Any]:
         """Add an item to a routine."""
@@ -188,7 +154,7 @@ class RoutineService(BaseService):
             active_repo = ActiveRoutineRepository(self.db)
             return active_repo.get_active_routine()
         
-        return self._execute_with_transaction(_get_active)
+        return self._execute_readonly(_get_active)
     
     def set_active_routine(self, routine_id: int) -> bool:
         """Set the active routine."""
@@ -222,7 +188,19 @@ class RoutineService(BaseService):
                 'active_routine_name': active_routine.get('B') if active_routine else None
             }
         
-        return self._execute_with_transaction(_get_stats)
+        return self._execute_readonly(_get_stats)
+
+# One instance per thread, created on first use. BaseService keeps the active
+# session on self.db, so a single instance shared by concurrent request threads
+# would have them overwrite each other's session.
+_thread_local = threading.local()
+
+def get_routine_service() -> RoutineService:
+    """Return the calling thread's RoutineService instance."""
+    service = getattr(_thread_local, 'routine_service', None)
+    if service is None:
+        service = _thread_local.routine_service = RoutineService()
+    return service
 
-# Singleton instance
-routine_service = RoutineService()
\ No newline at end of file
+# Module-level name kept for existing imports; resolves per thread on each use
+routine_service = LocalProxy(get_routine_service)
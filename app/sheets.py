@@ -14,24 +14,55 @@ import json
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 
-# Global rate limiting for batch operations
-_last_batch_operation_time = 0
+# Global rate limiting for batch operations: a token bucket lets short bursts through
+# immediately and paces sustained traffic to BATCH_OPERATIONS_PER_SECOND on average
+BATCH_OPERATIONS_PER_SECOND = 1.0
+BATCH_OPERATION_BURST = 5
+_batch_tokens = float(BATCH_OPERATION_BURST)
+_batch_tokens_updated = time.monotonic()
 _batch_operation_lock = threading.Lock()
 
 def _throttle_batch_operation():
-    """Ensure minimum time between batch operations to avoid rate limits"""
-    global _last_batch_operation_time
+    """Take a token for a batch operation, sleeping only when the bucket is empty"""
+    global _batch_tokens, _batch_tokens_updated
     with _batch_operation_lock:
-        current_time = time.time()
-        time_since_last = current_time - _last_batch_operation_time
-        min_interval = 1.0  # Minimum 1 second between batch operations
-        
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
+        now = time.monotonic()
+        _batch_tokens = min(BATCH_OPERATION_BURST,
+                            _batch_tokens + (now - _batch_tokens_updated) * BATCH_OPERATIONS_PER_SECOND)
+        _batch_tokens_updated = now
+
+        if _batch_tokens < 1:
+            sleep_time = (1 - _batch_tokens) / BATCH_OPERATIONS_PER_SECOND
             logging.info(f"Throttling batch operation - sleeping {sleep_time:.2f}s")
             time.sleep(sleep_time)
-        
-        _last_batch_operation_time = time.time()
+            _batch_tokens = 1.0
+            _batch_tokens_updated = time.monotonic()
+
+        _batch_tokens -= 1
+
+RATE_LIMIT_MAX_DELAY = 30  # Upper bound (seconds) on any single rate-limit wait
+
+def _retry_after_seconds(error):
+    """Seconds requested by a Retry-After header on a Sheets API error, or None."""
+    # gspread APIError carries a requests Response; googleapiclient HttpError an httplib2 Response (a dict)
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if headers is None:
+        headers = getattr(error, 'resp', None)
+    try:
+        value = headers.get('retry-after') if headers is not None else None
+        return float(value) if value is not None else None
+    except (AttributeError, TypeError, ValueError):  # e.g. the HTTP-date form
+        return None
+
+def _error_status_code(error):
+    """HTTP status of a gspread APIError or googleapiclient HttpError, or None for other errors."""
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
 
 def retry_on_rate_limit(func, max_retries=3, base_delay=1):
     """
@@ -43,24 +74,29 @@ def retry_on_rate_limit(func, max_retries=3, base_delay=1):
         try:
             return func()
         except Exception as e:
-            error_str = str(e).lower()
-            # Check for various rate limit error messages
-            is_rate_limit = any(phrase in error_str for phrase in [
-                'quota exceeded', 'rate_limit_exceeded', 'too many requests',
-                '429', 'rate limit', 'quota', 'exceed', 'throttl'
-            ])
-            
-            # Also check for specific Google API errors
-            if hasattr(e, 'resp') and hasattr(e.resp, 'status'):
-                if e.resp.status in ['429', 429]:  # Too Many Requests
-                    is_rate_limit = True
+            # Decide from the HTTP status when the error carries one. 403 still needs the
+            # message: Google also reports quota errors as 403 rateLimitExceeded
+            status = _error_status_code(e)
+            if status == 429:  # Too Many Requests
+                is_rate_limit = True
+            elif status is not None and status != 403:
+                is_rate_limit = False
+            else:
+                error_str = str(e).lower()
+                # Check for various rate limit error messages
+                is_rate_limit = any(phrase in error_str for phrase in [
+                    'quota exceeded', 'rate_limit_exceeded', 'too many requests',
+                    '429', 'rate limit', 'quota', 'exceed', 'throttl'
+                ])
             
             if is_rate_limit and attempt < max_retries:
-                # Exponential backoff with jitter: 1-2s, 2-4s, 4-8s
-                delay = base_delay * (2 ** attempt)
+                # Honor the server's Retry-After if given, else exponential backoff: 1-2s, 2-4s, 4-8s
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    delay = base_delay * (2 ** attempt)
                 # Add random jitter (0-50% of delay) to prevent thundering herd
                 jitter = random.uniform(0, delay * 0.5)
-                total_delay = delay + jitter
+                total_delay = min(delay + jitter, RATE_LIMIT_MAX_DELAY)
                 logging.warning(f"Rate limit hit, retrying in {total_delay:.2f}s (attempt {attempt + 1}/{max_retries + 1})")
                 time.sleep(total_delay)
                 continue
@@ -153,6 +189,24 @@ def invalidate_caches():
     """Invalidate all caches when data is modified."""
     get_credentials.cache_clear()
     get_spread.cache_clear()
+    with _worksheet_cache_lock:
+        _worksheet_cache.clear()
+
+# Worksheet handles by (spreadsheet id, title). spread.worksheet() fetches the whole
+# spreadsheet's metadata on every call, but a handle stays valid as long as the sheet exists.
+_worksheet_cache = {}
+_worksheet_cache_lock = threading.Lock()
+
+def _cached_worksheet(spread, title):
+    """Return spread.worksheet(title), reusing the handle from an earlier lookup (raises WorksheetNotFound)."""
+    key = (spread.id, title)
+    with _worksheet_cache_lock:
+        worksheet = _worksheet_cache.get(key)
+    if worksheet is None:
+        worksheet = spread.worksheet(title)
+        with _worksheet_cache_lock:
+            _worksheet_cache[key] = worksheet
+    return worksheet
 
 def sheet_to_records(worksheet, is_routine_worksheet=True, max_empty_rows=50):
     """Convert worksheet data to list of dictionaries.
@@ -224,26 +278,23 @@ def sheet_to_records(worksheet, is_routine_worksheet=True, max_empty_rows=50):
         logging.debug(f"Number of data rows loaded from {worksheet.title}: {len(data_rows)}")
         
         # Convert rows to records using column letters
+        column_letters = [chr(ord('A') + idx) for idx in range(num_columns)]
         processed_records = []
         for row in data_rows:
-            record = {}
-            # Ensure we have all columns by padding with empty strings
+            # Ensure we have all columns by padding with empty strings (zip drops any extras)
             padded_row = row + [''] * (num_columns - len(row))
-            
-            # Process each column
-            for idx in range(num_columns):
-                col_letter = chr(ord('A') + idx)
-                value = padded_row[idx] if idx < len(padded_row) else ''
-                # Just store the value as-is if it exists, otherwise empty string
-                record[col_letter] = value if value not in (None, '') else ''
-                
-            processed_records.append(record)
+            # Just store the value as-is if it exists, otherwise empty string
+            processed_records.append({
+                col_letter: '' if value is None else value
+                for col_letter, value in zip(column_letters, padded_row)
+            })
         
-        # Log the sequences for debugging
-        logging.debug(f"ID sequence: {[r.get('A') for r in processed_records[:10]]}")  # Only show first 10
-        if worksheet.title != 'Routines':  # Only show order sequence for non-Routines sheets
-            order_col = 'C' if is_routine_worksheet else 'G'
-            logging.debug(f"Order sequence: {[r.get(order_col) for r in processed_records[:10]]}")  # Only show first 10
+        # Log the sequences for debugging (only built when DEBUG logging is on)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"ID sequence: {[r.get('A') for r in processed_records[:10]]}")  # Only show first 10
+            if worksheet.title != 'Routines':  # Only show order sequence for non-Routines sheets
+                order_col = 'C' if is_routine_worksheet else 'G'
+                logging.debug(f"Order sequence: {[r.get(order_col) for r in processed_records[:10]]}")  # Only show first 10
         
         return processed_records
     except Exception as e:
@@ -326,7 +377,7 @@ def initialize_routines_sheet():
         
         # Check if Routines sheet exists
         try:
-            sheet = spread.worksheet('Routines')
+            sheet = _cached_worksheet(spread, 'Routines')
             logging.debug("Routines sheet already exists")
             return True
                 
@@ -345,7 +396,7 @@ def create_routine(routine_name):
         spread = get_spread()
         
         # Get current routines to check for duplicates and get next ID
-        routines_sheet = spread.worksheet('Routines')
+        routines_sheet = _cached_worksheet(spread, 'Routines')
         current_routines = get_all_routine_records()
         
         # Check for duplicate names (case insensitive)
@@ -415,7 +466,7 @@ def get_all_items():
         spread = get_spread()
         logging.debug("Reading from Items sheet...")
         
-        worksheet = spread.worksheet('Items')
+        worksheet = _cached_worksheet(spread, 'Items')
         records = sheet_to_records(worksheet, is_routine_worksheet=False)
         
         return records
@@ -451,7 +502,7 @@ def add_item(item):
         logging.debug(f"Normalized item data: {item}")
         
         # Get the worksheet and current records
-        worksheet = spread.worksheet('Items')
+        worksheet = _cached_worksheet(spread, 'Items')
         records = sheet_to_records(worksheet, is_routine_worksheet=False)
         logging.debug(f"Current records: {records}")
         
@@ -498,7 +549,7 @@ def update_item(item_id, item):
         logging.debug(f"Received item data: {item}")
         
         # Get the worksheet and current records
-        worksheet = spread.worksheet('Items')
+        worksheet = _cached_worksheet(spread, 'Items')
         records = sheet_to_records(worksheet, is_routine_worksheet=False)
         
         # Find and update the item
@@ -535,7 +586,7 @@ def delete_item(item_id):
         logging.debug(f"Starting delete operation for item_id: {item_id}")
         
         # Get the worksheet and current records
-        worksheet = spread.worksheet('Items')
+        worksheet = _cached_worksheet(spread, 'Items')
         records = sheet_to_records(worksheet, is_routine_worksheet=False)
         
         # Find the item to delete
@@ -572,7 +623,7 @@ def update_items_order(items):
         logging.debug("Starting order update operation...")
         
         # Get the worksheet
-        worksheet = spread.worksheet('Items')
+        worksheet = _cached_worksheet(spread, 'Items')
         
         # Update order values to match new positions
         for i, item in enumerate(items):
@@ -595,7 +646,7 @@ def get_routine(routine_id):
     
     try:
         # Get the worksheet directly using the ID as the sheet name
-        worksheet = spread.worksheet(str(routine_id))
+        worksheet = _cached_worksheet(spread, str(routine_id))
         records = sheet_to_records(worksheet, is_routine_worksheet=True)
         return records
     except Exception:
@@ -608,7 +659,7 @@ def get_active_routine():
         
         # Get ActiveRoutine sheet (should already exist)
         try:
-            sheet = spread.worksheet('ActiveRoutine')
+            sheet = _cached_worksheet(spread, 'ActiveRoutine')
         except gspread.WorksheetNotFound:
             # Only create if it truly doesn't exist
             try:
@@ -617,7 +668,7 @@ def get_active_routine():
             except Exception as create_error:
                 # If creation fails (e.g., already exists), try to get it again
                 if "already exists" in str(create_error):
-                    sheet = spread.worksheet('ActiveRoutine')
+                    sheet = _cached_worksheet(spread, 'ActiveRoutine')
                 else:
                     raise create_error
             
@@ -637,7 +688,7 @@ def set_routine_active(routine_id, active=True):
         
         # Get ActiveRoutine sheet (should already exist)
         try:
-            sheet = spread.worksheet('ActiveRoutine')
+            sheet = _cached_worksheet(spread, 'ActiveRoutine')
         except gspread.WorksheetNotFound:
             # Only create if it truly doesn't exist
             try:
@@ -645,7 +696,7 @@ def set_routine_active(routine_id, active=True):
             except Exception as create_error:
                 # If creation fails (e.g., already exists), try to get it again
                 if "already exists" in str(create_error):
-                    sheet = spread.worksheet('ActiveRoutine')
+                    sheet = _cached_worksheet(spread, 'ActiveRoutine')
                 else:
                     raise create_error
         
@@ -672,7 +723,7 @@ def get_all_routine_records():
     """Get all records from the Routines index sheet."""
     try:
         spread = get_spread()
-        worksheet = spread.worksheet('Routines')
+        worksheet = _cached_worksheet(spread, 'Routines')
         # Routines index sheet is NOT a routine worksheet - it's the index of all routines
         records = sheet_to_records(worksheet, is_routine_worksheet=False)
         return records
@@ -711,7 +762,7 @@ def test_sheets_connection():
     logging.debug("Entered test_sheets_connection")
     try:
         spread = get_spread()
-        worksheet = spread.worksheet('Items')
+        worksheet = _cached_worksheet(spread, 'Items')
         records = sheet_to_records(worksheet, is_routine_worksheet=False)
         logging.debug(f"Read {len(records)} items from the sheet")
         
@@ -733,7 +784,7 @@ def add_to_routine(routine_id, item_id, notes=""):
     """Add an item to a routine."""
     try:
         spread = get_spread()
-        worksheet = spread.worksheet(str(routine_id))  # Use ID as sheet name
+        worksheet = _cached_worksheet(spread, str(routine_id))  # Use ID as sheet name
         
         # Get only the ID and order columns to minimize data transfer
         id_col = worksheet.col_values(1)[1:]  # Skip header row
@@ -766,7 +817,7 @@ def update_routine_order(routine_id, items):
         logging.debug(f"Starting routine order update for {routine_id}...")
         logging.debug(f"Received items for reordering: {items}")
         
-        worksheet = spread.worksheet(str(routine_id))  # Use ID as sheet name
+        worksheet = _cached_worksheet(spread, str(routine_id))  # Use ID as sheet name
         
         # Get existing items to ensure we have all data
         existing_items = sheet_to_records(worksheet, is_routine_worksheet=True)
@@ -803,7 +854,7 @@ def update_routines_order(routines):
     try:
         # Get the Routines sheet
         spread = get_spread()
-        routines_sheet = spread.worksheet('Routines')
+        routines_sheet = _cached_worksheet(spread, 'Routines')
 
         # Get existing routines
         existing_routines = sheet_to_records(routines_sheet, is_routine_worksheet=True)
@@ -866,7 +917,7 @@ def delete_routine(routine_id):
             
             # Try to get the worksheet first
             try:
-                worksheet = spread.worksheet(routine_id_str)
+                worksheet = _cached_worksheet(spread, routine_id_str)
                 logging.debug(f"Found worksheet with title: {worksheet.title}")
             except Exception as ws_get_error:
                 logging.error(f"Error getting worksheet: {str(ws_get_error)}")
@@ -875,6 +926,8 @@ def delete_routine(routine_id):
             
             # If we got the worksheet, try to delete it
             spread.del_worksheet(worksheet)
+            with _worksheet_cache_lock:
+                _worksheet_cache.pop((spread.id, routine_id_str), None)
             logging.debug(f"Successfully deleted worksheet for routine {routine_id_str}")
         except gspread.exceptions.WorksheetNotFound:
             logging.warning(f"Worksheet {routine_id_str} not found, continuing with routine deletion")
@@ -887,7 +940,7 @@ def delete_routine(routine_id):
         
         # Remove from Routines index and update orders
         try:
-            routines_sheet = spread.worksheet('Routines')
+            routines_sheet = _cached_worksheet(spread, 'Routines')
             records = sheet_to_records(routines_sheet)
             logging.debug(f"Current records before deletion: {records}")
             
@@ -928,7 +981,7 @@ def update_routine_item(routine_id, item_id, item):
     """Update a single item in a routine (e.g., to update notes)."""
     try:
         spread = get_spread()
-        worksheet = spread.worksheet(str(routine_id))  # Use ID as sheet name
+        worksheet = _cached_worksheet(spread, str(routine_id))  # Use ID as sheet name
         records = sheet_to_records(worksheet, is_routine_worksheet=True)
         
         # Find and update the item
@@ -963,7 +1016,7 @@ def remove_from_routine(routine_id, routine_entry_id):
     try:
         logging.debug(f"Starting remove_from_routine for routine: {routine_id}, routine_entry_id: {routine_entry_id}")
         spread = get_spread()
-        worksheet = spread.worksheet(str(routine_id))  # Use ID as sheet name
+        worksheet = _cached_worksheet(spread, str(routine_id))  # Use ID as sheet name
         records = sheet_to_records(worksheet, is_routine_worksheet=True)
         logging.debug(f"Initial records: {records}")
         
@@ -1013,15 +1066,25 @@ def get_worksheet(worksheet_name):
         raise
 
 # ChordCharts functions
+
+# Set once the ChordCharts sheet is known to exist, so later calls skip the Sheets API lookup.
+# Not reset by invalidate_caches(): data writes never remove the sheet.
+_chordcharts_sheet_ready = False
+
 def initialize_chordcharts_sheet():
     """Create and initialize the ChordCharts sheet if it doesn't exist."""
+    global _chordcharts_sheet_ready
+    if _chordcharts_sheet_ready:
+        return True
+
     try:
         spread = get_spread()
         
         # Check if ChordCharts sheet exists
         try:
-            sheet = spread.worksheet('ChordCharts')
+            sheet = _cached_worksheet(spread, 'ChordCharts')
             logging.debug("ChordCharts sheet already exists")
+            _chordcharts_sheet_ready = True
             return True
                 
         except gspread.WorksheetNotFound:
@@ -1031,6 +1094,7 @@ def initialize_chordcharts_sheet():
             # Add header row
             header_row = ['ChordID', 'ItemID', 'Title', 'ChordData', 'CreatedAt', 'Order']
             sheet.update('A1:F1', [header_row])
+            _chordcharts_sheet_ready = True
             return True
             
     except Exception as e:
@@ -1045,7 +1109,7 @@ def get_chord_charts_for_item(item_id):
         # Initialize sheet if it doesn't exist
         initialize_chordcharts_sheet()
         
-        sheet = spread.worksheet('ChordCharts')
+        sheet = _cached_worksheet(spread, 'ChordCharts')
         records = sheet_to_records(sheet, is_routine_worksheet=False)
         
         # Filter by ItemID (handle comma-separated values) and sort by Order
@@ -1110,7 +1174,7 @@ def add_chord_chart(item_id, chord_data):
         # Initialize sheet if it doesn't exist
         initialize_chordcharts_sheet()
         
-        sheet = spread.worksheet('ChordCharts')
+        sheet = _cached_worksheet(spread, 'ChordCharts')
         records = sheet_to_records(sheet, is_routine_worksheet=False)
         
         # Generate new ChordID
@@ -1252,7 +1316,7 @@ def batch_add_chord_charts(item_id, chord_charts_data):
         # Initialize sheet if it doesn't exist
         initialize_chordcharts_sheet()
         
-        sheet = spread.worksheet('ChordCharts')
+        sheet = _cached_worksheet(spread, 'ChordCharts')
         records = sheet_to_records(sheet, is_routine_worksheet=False)
         
         # Generate new ChordIDs starting from max existing
@@ -1352,7 +1416,7 @@ def delete_chord_chart(chord_id):
     """Delete a chord chart by ID."""
     try:
         spread = get_spread()
-        sheet = spread.worksheet('ChordCharts')
+        sheet = _cached_worksheet(spread, 'ChordCharts')
         records = sheet_to_records(sheet, is_routine_worksheet=False)
         
         # Find and remove the chart
@@ -1401,7 +1465,7 @@ def batch_delete_chord_charts(chord_ids):
         # Add small delay before starting to avoid back-to-back API calls
         time.sleep(0.2)
         spread = get_spread()
-        sheet = spread.worksheet('ChordCharts')
+        sheet = _cached_worksheet(spread, 'ChordCharts')
         records = sheet_to_records(sheet, is_routine_worksheet=False)
         return spread, sheet, records
     
@@ -1488,7 +1552,7 @@ def update_chord_chart(chord_id, chord_data):
     """Update a chord chart by ID."""
     try:
         spread = get_spread()
-        sheet = spread.worksheet('ChordCharts')
+        sheet = _cached_worksheet(spread, 'ChordCharts')
         records = sheet_to_records(sheet, is_routine_worksheet=False)
         
         # Find the chart to update
@@ -1545,7 +1609,7 @@ def update_chord_charts_order(item_id, chord_charts):
     """Update the order of chord charts for an item."""
     try:
         spread = get_spread()
-        sheet = spread.worksheet('ChordCharts')
+        sheet = _cached_worksheet(spread, 'ChordCharts')
         records = sheet_to_records(sheet, is_routine_worksheet=False)
         
         # Create a map of chord IDs to new orders
@@ -1576,7 +1640,7 @@ def get_common_chord_charts():
         
         # Try to get the CommonChords sheet, create if it doesn't exist
         try:
-            sheet = spread.worksheet('CommonChords')
+            sheet = _cached_worksheet(spread, 'CommonChords')
         except gspread.WorksheetNotFound:
             logging.info("CommonChords sheet not found, creating it...")
             # Create the sheet with headers
@@ -1632,7 +1696,7 @@ def search_common_chord_charts(chord_name):
         
         # Try to get the CommonChords sheet
         try:
-            sheet = spread.worksheet('CommonChords')
+            sheet = _cached_worksheet(spread, 'CommonChords')
         except gspread.WorksheetNotFound:
             logging.info("CommonChords sheet not found")
             return []
@@ -1751,7 +1815,7 @@ def seed_common_chord_charts():
         
         # Get or create the CommonChords sheet
         try:
-            sheet = spread.worksheet('CommonChords')
+            sheet = _cached_worksheet(spread, 'CommonChords')
         except gspread.WorksheetNotFound:
             logging.info("CommonChords sheet not found, creating it...")
             sheet = spread.add_worksheet(title='CommonChords', rows=100, cols=6)
@@ -1954,7 +2018,7 @@ def bulk_import_chords_from_tormodkv(chord_names=None):
         # Get or create CommonChords sheet
         spread = get_spread()
         try:
-            sheet = spread.worksheet('CommonChords')
+            sheet = _cached_worksheet(spread, 'CommonChords')
         except gspread.WorksheetNotFound:
             sheet = spread.add_worksheet(title='CommonChords', rows=1000, cols=6)
             sheet.update('A1:F1', [['ChordID', 'ItemID', 'Title', 'ChordData', 'CreatedAt', 'Order']])
@@ -2083,7 +2147,7 @@ def bulk_import_chords_from_local_file(chord_names=None, local_file_path=None):
         # Get or create CommonChords sheet
         spread = get_spread()
         try:
-            sheet = spread.worksheet('CommonChords')
+            sheet = _cached_worksheet(spread, 'CommonChords')
         except gspread.WorksheetNotFound:
             sheet = spread.add_worksheet(title='CommonChords', rows=1000, cols=6)
             sheet.update('A1:F1', [['ChordID', 'ItemID', 'Title', 'ChordData', 'CreatedAt', 'Order']])
@@ -2208,7 +2272,7 @@ def copy_chord_charts_to_items(source_item_id, target_item_ids):
     """
     try:
         spread = get_spread()
-        sheet = spread.worksheet('ChordCharts')
+        sheet = _cached_worksheet(spread, 'ChordCharts')
         records = sheet_to_records(sheet, is_routine_worksheet=False)
         
         source_item_id_str = str(source_item_id)
@@ -2301,7 +2365,7 @@ def get_common_chords_efficiently():
         
         # Try to get the CommonChords sheet
         try:
-            sheet = spread.worksheet('CommonChords')
+            sheet = _cached_worksheet(spread, 'CommonChords')
         except gspread.WorksheetNotFound:
             logging.info("CommonChords sheet not found")
             return []
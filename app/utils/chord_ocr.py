@@ -3,16 +3,140 @@ OCR-based chord extraction module for power-efficient chord chart creation.
 Based on successful testing with "For What It's Worth" PDF extraction.
 """
 import pytesseract
-from pdf2image import convert_from_bytes, convert_from_path
+from pdf2image import convert_from_bytes, convert_from_path, pdfinfo_from_bytes
 import re
 import logging
 from collections import Counter
-from PIL import Image
+from PIL import Image, ImageOps
 import io
+import os
+import copy
 import base64
+import hashlib
+import tempfile
+import threading
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Each tesseract process or engine is limited to one OpenMP thread: with one per core,
+# tesseract's own threading only oversubscribes the CPU. Set before tesserocr loads
+# libtesseract/libgomp, which read it at load time; subprocesses inherit it.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+# Optional in-process tesseract bindings: keep the engine loaded between pages
+# instead of starting a tesseract process (and reloading eng.traineddata) per call
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Comprehensive chord pattern based on successful "For What It's Worth" extraction
+# Matches: A, Em, F#m7, Cadd9, Dsus4, etc. Compiled once at import.
+CHORD_PATTERN = re.compile(r'\b[A-G][#b]?(?:maj|min|m|sus|add|dim|aug)?\d*\b', re.IGNORECASE)
+
+# Text quality patterns (see _assess_text_quality)
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+GIBBERISH_PATTERNS = (
+    re.compile(r'[a-zA-Z]{1}\s+[a-zA-Z]{1}\s+[a-zA-Z]{1}'),  # Single chars: "o D t"
+    re.compile(r'^[^a-zA-Z]*[a-zA-Z]{1,2}[^a-zA-Z]*$'),       # Very short isolated chars
+    re.compile(r'[a-zA-Z][^a-zA-Z\s]{3,}[a-zA-Z]'),          # Chars mixed with symbols
+)
+
+# Common words that match the chord pattern but aren't chords (lowercase)
+FALSE_POSITIVE_WORDS = frozenset({
+    'a', 'an', 'and', 'as', 'at', 'be', 'by', 'do', 'go', 'he', 'if', 'in',
+    'is', 'it', 'me', 'my', 'no', 'of', 'on', 'or', 'so', 'to', 'up', 'we',
+    'all', 'are', 'but', 'can', 'for', 'get', 'had', 'has', 'her', 'him',
+    'his', 'how', 'its', 'may', 'new', 'not', 'now', 'old', 'our', 'out',
+    'see', 'the', 'too', 'was', 'way', 'who', 'you', 'your'
+})
+# The same words in the case matched chords are normalized to ("the" -> "The")
+FALSE_POSITIVE_CHORDS = frozenset(word.capitalize() for word in FALSE_POSITIVE_WORDS)
+
+# PDF pages are rendered at 150 DPI grayscale and binarized before OCR. That is
+# plenty for chord names and tesseract's runtime scales with pixel count.
+PDF_RENDER_DPI = 150
+PDF_FALLBACK_DPI = 300  # Re-render at this DPI when the 150 DPI text looks garbled
+MIN_TEXT_QUALITY = 0.3  # _assess_text_quality score below which OCR text counts as garbled
+BINARIZE_THRESHOLD = 180
+PDF_PAGE_CHUNK_SIZE = 10  # Pages rendered per pdf2image call
+TESSERACT_CONFIG = '--psm 6 -c tessedit_do_invert=0'  # Uniform text block, skip invert detection
+TESSERACT_LANG = 'eng'  # Explicit language so tesseract never has to pick one
+IMAGE_MAX_DIMENSION = 2000  # Uploaded images are downscaled to fit within this box
+MIN_EMBEDDED_TEXT_CHARS = 20  # Pages whose text layer has fewer characters than this are OCR'd
+
+# pytesseract runs the tesseract binary in a subprocess, so threads are enough to
+# OCR independent PDF pages on all cores. Created on first use, shared across requests.
+# Each tesseract engine is limited to one OpenMP thread (OMP_THREAD_LIMIT, set above).
+_ocr_executor = None
+_ocr_executor_lock = threading.Lock()
+
+def _get_ocr_executor():
+    """Return the shared page-OCR executor, creating it on first use."""
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is None:
+            _ocr_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                               thread_name_prefix='chord-ocr')
+        return _ocr_executor
+
+# One tesserocr engine per thread (an engine must not be shared between threads)
+_tesserocr_local = threading.local()
+
+def _get_tesserocr_api():
+    """Return this thread's tesserocr engine, initializing it on first use."""
+    api = getattr(_tesserocr_local, 'api', None)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(lang=TESSERACT_LANG, psm=tesserocr.PSM.SINGLE_BLOCK)
+        api.SetVariable('tessedit_do_invert', '0')
+        _tesserocr_local.api = api
+    return api
+
+def _image_to_text(image):
+    """OCR a PIL image with tesserocr when installed, otherwise the tesseract CLI via pytesseract."""
+    if TESSEROCR_AVAILABLE:
+        api = _get_tesserocr_api()
+        api.SetImage(image)
+        return api.GetUTF8Text()
+    return pytesseract.image_to_string(image, lang=TESSERACT_LANG, config=TESSERACT_CONFIG)
+
+# Successful OCR results keyed by (file_type, sha256 of the uploaded content), so
+# re-uploading the same file skips render + OCR entirely. Least recently used evicted.
+OCR_CACHE_MAX_ENTRIES = 128
+_ocr_cache = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+
+# OCR text of individual rendered PDF pages keyed by a hash of the page image, so
+# pages shared between uploads (e.g. an edited PDF re-uploaded) are OCR'd once.
+PAGE_TEXT_CACHE_MAX_ENTRIES = 1024
+_page_text_cache = OrderedDict()
+_page_text_cache_lock = threading.Lock()
+
+def _ocr_cache_key(file_data, file_type):
+    """Content-addressed cache key for an upload (bytes for PDFs, base64 str for images)."""
+    data = file_data.encode() if isinstance(file_data, str) else file_data
+    return file_type, hashlib.sha256(data).hexdigest()
+
+def _lru_get(cache, lock, key):
+    """Look up key in an LRU OrderedDict cache, marking it recently used. Returns None on miss."""
+    with lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+def _lru_put(cache, lock, key, value, max_entries):
+    """Store value in an LRU OrderedDict cache, evicting the least recently used entry."""
+    with lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > max_entries:
+            cache.popitem(last=False)
+
 def extract_chords_from_file(file_data, file_type='pdf', filename='unknown'):
     """
     Extract chord names from PDF or image files using OCR.
@@ -28,17 +152,14 @@ def extract_chords_from_file(file_data, file_type='pdf', filename='unknown'):
             'chords': list of unique chord names,
             'chord_counts': dict of chord name -> count,
             'confidence': 'high' | 'medium' | 'low',
+            'text_quality': _assess_text_quality score of the full text,
             'raw_text': extracted text (for debugging)
         }
     """
     try:
         logger.info(f"[CHORD_OCR] Starting OCR extraction for {filename} (type: {file_type})")
 
-        if file_type == 'pdf':
-            return _extract_from_pdf(file_data, filename)
-        elif file_type == 'image':
-            return _extract_from_image(file_data, filename)
-        else:
+        if file_type not in ('pdf', 'image'):
             return {
                 'success': False,
                 'error': f'Unsupported file type: {file_type}',
@@ -47,6 +168,21 @@ def extract_chords_from_file(file_data, file_type='pdf', filename='unknown'):
                 'confidence': 'low'
             }
 
+        cache_key = _ocr_cache_key(file_data, file_type)
+        cached = _lru_get(_ocr_cache, _ocr_cache_lock, cache_key)
+        if cached is not None:
+            logger.info(f"[CHORD_OCR] Using cached OCR result for {filename}")
+            return copy.deepcopy(cached)
+
+        if file_type == 'pdf':
+            result = _extract_from_pdf(file_data, filename)
+        else:
+            result = _extract_from_image(file_data, filename)
+
+        if result.get('success'):
+            _lru_put(_ocr_cache, _ocr_cache_lock, cache_key, copy.deepcopy(result), OCR_CACHE_MAX_ENTRIES)
+        return result
+
     except Exception as e:
         logger.error(f"[CHORD_OCR] Error extracting chords from {filename}: {str(e)}")
         return {
@@ -57,22 +193,123 @@ def extract_chords_from_file(file_data, file_type='pdf', filename='unknown'):
             'confidence': 'low'
         }
 
-def _extract_from_pdf(pdf_bytes, filename):
-    """Extract chords from PDF using pdf2image + tesseract"""
+def _ocr_pdf_page(page_path):
+    """Load one rendered grayscale PDF page from disk, binarize it and OCR it (cached by page hash)."""
+    with open(page_path, 'rb') as page_file:
+        page_bytes = page_file.read()
+    os.unlink(page_path)  # Free disk as we go; the temp dir is removed afterwards anyway
+
+    page_key = hashlib.blake2b(page_bytes, digest_size=16).hexdigest()
+    text = _lru_get(_page_text_cache, _page_text_cache_lock, page_key)
+    if text is not None:
+        return text
+
+    with Image.open(io.BytesIO(page_bytes)) as page:
+        # Stretch contrast first so faint scans still separate cleanly at the threshold
+        page = ImageOps.autocontrast(page).point(lambda p: 255 if p > BINARIZE_THRESHOLD else 0, mode='1')
+    del page_bytes
+    text = _image_to_text(page)
+    _lru_put(_page_text_cache, _page_text_cache_lock, page_key, text, PAGE_TEXT_CACHE_MAX_ENTRIES)
+    return text
+
+def _iter_page_ranges(page_numbers, chunk_size):
+    """Group ascending page numbers into (first, last) runs of consecutive pages, at most chunk_size long."""
+    first_page = last_page = None
+    for page_number in page_numbers:
+        if first_page is not None and page_number == last_page + 1 and page_number - first_page < chunk_size:
+            last_page = page_number
+            continue
+        if first_page is not None:
+            yield first_page, last_page
+        first_page = last_page = page_number
+    if first_page is not None:
+        yield first_page, last_page
+
+def _iter_pdf_page_chunks(pdf_bytes, output_folder, dpi=PDF_RENDER_DPI, chunk_size=PDF_PAGE_CHUNK_SIZE,
+                          page_numbers=None):
+    """Render a PDF (or just page_numbers) to page image files chunk_size pages at a time, yielding each chunk's paths."""
+    if page_numbers is None:
+        page_numbers = range(1, pdfinfo_from_bytes(pdf_bytes)['Pages'] + 1)
+    for first_page, last_page in _iter_page_ranges(page_numbers, chunk_size):
+        yield convert_from_bytes(pdf_bytes, dpi=dpi, grayscale=True, fmt='png',
+                                 thread_count=os.cpu_count() or 1,
+                                 first_page=first_page, last_page=last_page,
+                                 output_folder=output_folder, paths_only=True)
+
+def _extract_embedded_pdf_text(pdf_bytes):
+    """
+    Read the PDF's own text layer with Poppler's pdftotext (installed alongside pdf2image).
+
+    Returns:
+        list: text of each page (layout kept, chords stay above lyrics), or None if it can't be read
+    """
     try:
-        # Convert PDF to images
-        logger.debug(f"[CHORD_OCR] Converting PDF {filename} to images")
-        pages = convert_from_bytes(pdf_bytes)
+        completed = subprocess.run(['pdftotext', '-layout', '-enc', 'UTF-8', '-', '-'],
+                                   input=pdf_bytes, capture_output=True, timeout=60, check=True)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"[CHORD_OCR] pdftotext unavailable or failed, OCRing every page: {str(e)}")
+        return None
+
+    # pdftotext ends every page with a form feed
+    pages = completed.stdout.decode('utf-8', errors='replace').split('\f')
+    if pages and pages[-1] == '':
+        pages.pop()
+    return pages
+
+def _ocr_pdf(pdf_bytes, dpi, page_numbers=None):
+    """Render a PDF (or just page_numbers) at the given DPI and OCR each page, returning the page texts in order."""
+    # Render PDF pages to files a chunk at a time rather than holding every page
+    # image in memory (or on disk); each page is only loaded while it is being OCR'd
+    texts = []
+    pending = []  # OCR futures of the previous chunk, in page order
+    executor = _get_ocr_executor()
+    with tempfile.TemporaryDirectory(prefix='chord-ocr-') as output_folder:
+        # Pipelined: the generator renders chunk N+1 while chunk N's pages are being
+        # OCR'd in parallel, so at most two chunks of page files exist at once
+        for page_paths in _iter_pdf_page_chunks(pdf_bytes, output_folder, dpi=dpi, page_numbers=page_numbers):
+            texts.extend(future.result() for future in pending)
+            logger.debug(f"[CHORD_OCR] Processing {len(page_paths)} pages at {dpi} DPI")
+            pending = [executor.submit(_ocr_pdf_page, page_path) for page_path in page_paths]
+        texts.extend(future.result() for future in pending)
+    return texts
+
+def _ocr_pdf_pages(pdf_bytes, filename, page_numbers=None):
+    """
+    OCR a PDF's pages, re-rendering once at PDF_FALLBACK_DPI if the text looks garbled.
+
+    Returns:
+        tuple: (page texts, _assess_text_quality score of their joined text, or None after a retry)
+    """
+    texts = _ocr_pdf(pdf_bytes, PDF_RENDER_DPI, page_numbers)
 
-        all_text = ""
-        for i, page in enumerate(pages):
-            logger.debug(f"[CHORD_OCR] Processing page {i+1}/{len(pages)}")
-            # Extract text with OCR
-            text = pytesseract.image_to_string(page)
-            all_text += text + "\n"
+    # Low resolution is cheaper but can garble small print; retry once at a higher DPI
+    text_quality = _assess_text_quality("".join(text + "\n" for text in texts))
+    if text_quality < MIN_TEXT_QUALITY:
+        logger.info(f"[CHORD_OCR] Low text quality at {PDF_RENDER_DPI} DPI for {filename}, retrying at {PDF_FALLBACK_DPI} DPI")
+        return _ocr_pdf(pdf_bytes, PDF_FALLBACK_DPI, page_numbers), None
+    return texts, text_quality
 
+def _extract_from_pdf(pdf_bytes, filename):
+    """Extract chords from PDF: embedded text where the PDF has it, pdf2image + tesseract for the rest"""
+    try:
+        text_quality = None  # Known up front only when every page was OCR'd
+        page_texts = _extract_embedded_pdf_text(pdf_bytes)
+        if page_texts is None:
+            logger.debug(f"[CHORD_OCR] Converting PDF {filename} to images")
+            page_texts, text_quality = _ocr_pdf_pages(pdf_bytes, filename)
+        else:
+            # Only scanned pages (no usable text layer) need rendering and OCR
+            scanned_pages = [page_number for page_number, text in enumerate(page_texts, start=1)
+                             if len(text.strip()) < MIN_EMBEDDED_TEXT_CHARS]
+            logger.debug(f"[CHORD_OCR] {len(page_texts) - len(scanned_pages)} of {len(page_texts)} pages in {filename} have embedded text")
+            if scanned_pages:
+                ocr_texts, _ = _ocr_pdf_pages(pdf_bytes, filename, scanned_pages)
+                for page_number, text in zip(scanned_pages, ocr_texts):
+                    page_texts[page_number - 1] = text
+
+        all_text = "".join(text + "\n" for text in page_texts)
         logger.debug(f"[CHORD_OCR] Extracted {len(all_text)} characters of text")
-        return _extract_chords_from_text(all_text, filename)
+        return _extract_chords_from_text(all_text, filename, text_quality)
 
     except Exception as e:
         logger.error(f"[CHORD_OCR] PDF processing error for {filename}: {str(e)}")
@@ -84,11 +321,16 @@ def _extract_from_image(image_data, filename):
         # Decode base64 image data
         logger.debug(f"[CHORD_OCR] Decoding image data for {filename}")
         image_bytes = base64.b64decode(image_data)
-        image = Image.open(io.BytesIO(image_bytes))
+        with io.BytesIO(image_bytes) as image_buffer, Image.open(image_buffer) as original:
+            # Upright, grayscale and bounded in size before OCR: a 4000x3000 RGB phone
+            # photo is ~36 MB decoded, and tesseract's runtime scales with pixel count
+            image = ImageOps.exif_transpose(original).convert('L')
+        del image_bytes
+        image.thumbnail((IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION), Image.LANCZOS)
 
         # Extract text with OCR
         logger.debug(f"[CHORD_OCR] Running OCR on image {filename}")
-        text = pytesseract.image_to_string(image)
+        text = _image_to_text(image)
 
         logger.debug(f"[CHORD_OCR] Extracted {len(text)} characters of text")
         return _extract_chords_from_text(text, filename)
@@ -97,32 +339,19 @@ def _extract_from_image(image_data, filename):
         logger.error(f"[CHORD_OCR] Image processing error for {filename}: {str(e)}")
         raise
 
-def _extract_chords_from_text(text, filename):
-    """Extract chord names from OCR text using proven regex patterns"""
+def _extract_chords_from_text(text, filename, text_quality=None):
+    """Extract chord names from OCR text using proven regex patterns (text_quality: score already computed for text)"""
     try:
         logger.debug(f"[CHORD_OCR] Analyzing text for chord patterns in {filename}")
 
-        # Comprehensive chord pattern based on successful "For What It's Worth" extraction
-        # Matches: A, Em, F#m7, Cadd9, Dsus4, etc.
-        chord_pattern = r'\b[A-G][#b]?(?:maj|min|m|sus|add|dim|aug)?\d*\b'
-
-        # Find all potential chords
-        potential_chords = re.findall(chord_pattern, text, re.IGNORECASE)
+        # Find and count potential chords in a single pass. Matches never contain
+        # whitespace, so normalizing case (first letter uppercase) is one capitalize()
+        chord_counts = Counter(map(str.capitalize, CHORD_PATTERN.findall(text)))
 
-        # Clean and filter chords
-        cleaned_chords = []
-        for chord in potential_chords:
-            # Convert to consistent case (first letter uppercase)
-            chord = chord.strip()
-            if len(chord) >= 1:
-                chord = chord[0].upper() + chord[1:].lower()
-                # Filter out obvious non-chords (common false positives)
-                if not _is_likely_false_positive(chord):
-                    cleaned_chords.append(chord)
-
-        # Count occurrences
-        chord_counts = Counter(cleaned_chords)
-        unique_chords = list(chord_counts.keys())
+        # Filter out obvious non-chords: one dict pop per known word instead of a check per match
+        for word in FALSE_POSITIVE_CHORDS:
+            chord_counts.pop(word, None)
+        unique_chords = list(chord_counts)
 
         # Determine confidence based on number of chords found
         confidence = _calculate_confidence(unique_chords, chord_counts, text)
@@ -135,6 +364,8 @@ def _extract_chords_from_text(text, filename):
             'chords': unique_chords,
             'chord_counts': dict(chord_counts),
             'confidence': confidence,
+            # Scored on the full text, not raw_text
+            'text_quality': text_quality if text_quality is not None else _assess_text_quality(text),
             'raw_text': text[:500] + '...' if len(text) > 500 else text  # Truncate for logging
         }
 
@@ -142,17 +373,6 @@ def _extract_chords_from_text(text, filename):
         logger.error(f"[CHORD_OCR] Text analysis error for {filename}: {str(e)}")
         raise
 
-def _is_likely_false_positive(chord):
-    """Filter out common false positives that match chord pattern but aren't chords"""
-    false_positives = {
-        'a', 'an', 'and', 'as', 'at', 'be', 'by', 'do', 'go', 'he', 'if', 'in',
-        'is', 'it', 'me', 'my', 'no', 'of', 'on', 'or', 'so', 'to', 'up', 'we',
-        'all', 'are', 'but', 'can', 'for', 'get', 'had', 'has', 'her', 'him',
-        'his', 'how', 'its', 'may', 'new', 'not', 'now', 'old', 'our', 'out',
-        'see', 'the', 'too', 'was', 'way', 'who', 'you', 'your'
-    }
-    return chord.lower() in false_positives
-
 def _calculate_confidence(chords, chord_counts, raw_text):
     """Calculate confidence level based on OCR results"""
     num_chords = len(chords)
@@ -187,16 +407,17 @@ def should_use_ocr_result(ocr_result, minimum_chords=2):
 
     chords = ocr_result.get('chords', [])
     confidence = ocr_result.get('confidence', 'low')
-    raw_text = ocr_result.get('raw_text', '')
 
     # Must have at least minimum_chords unique chords
     if len(chords) < minimum_chords:
         logger.info(f"[CHORD_OCR] Only found {len(chords)} chords, need {minimum_chords}. Falling back to LLM.")
         return False
 
-    # NEW: Text quality checks to catch gibberish
-    text_quality_score = _assess_text_quality(raw_text)
-    if text_quality_score < 0.3:  # 30% quality threshold
+    # NEW: Text quality checks to catch gibberish (raw_text is truncated, so only a fallback)
+    text_quality_score = ocr_result.get('text_quality')
+    if text_quality_score is None:
+        text_quality_score = _assess_text_quality(ocr_result.get('raw_text', ''))
+    if text_quality_score < MIN_TEXT_QUALITY:  # 30% quality threshold
         logger.info(f"[CHORD_OCR] Poor text quality (score: {text_quality_score:.2f}). Text appears garbled, falling back to LLM.")
         return False
 
@@ -231,24 +452,15 @@ def _assess_text_quality(text):
     cleaned_text = text.strip()
     total_chars = len(cleaned_text)
 
-    # Count readable elements
-    readable_chars = 0
-    word_count = 0
-    single_char_fragments = 0
-
-    # Split into words and analyze
-    words = re.split(r'\s+', cleaned_text)
-    for word in words:
-        # Remove punctuation for analysis
-        clean_word = re.sub(r'[^\w]', '', word)
-        if len(clean_word) == 0:
-            continue
+    # Remove punctuation for analysis in one pass over the whole text (whitespace kept),
+    # then split into words; punctuation-only words vanish
+    word_lengths = [len(word) for word in PUNCTUATION_PATTERN.sub('', cleaned_text).split()]
 
-        if len(clean_word) == 1:
-            single_char_fragments += 1
-        elif len(clean_word) >= 2:
-            word_count += 1
-            readable_chars += len(clean_word)
+    # Count readable elements
+    single_char_fragments = word_lengths.count(1)
+    multi_char_lengths = [length for length in word_lengths if length >= 2]
+    word_count = len(multi_char_lengths)
+    readable_chars = sum(multi_char_lengths)
 
     # Calculate quality metrics
     if total_chars == 0:
@@ -269,14 +481,8 @@ def _assess_text_quality(text):
 
     # Check for common gibberish patterns
     gibberish_penalty = 0.0
-    gibberish_patterns = [
-        r'[a-zA-Z]{1}\s+[a-zA-Z]{1}\s+[a-zA-Z]{1}',  # Single chars: "o D t"
-        r'^[^a-zA-Z]*[a-zA-Z]{1,2}[^a-zA-Z]*$',       # Very short isolated chars
-        r'[a-zA-Z][^a-zA-Z\s]{3,}[a-zA-Z]',          # Chars mixed with symbols
-    ]
-
-    for pattern in gibberish_patterns:
-        if re.search(pattern, cleaned_text):
+    for pattern in GIBBERISH_PATTERNS:
+        if pattern.search(cleaned_text):
             gibberish_penalty += 0.2
 
     # Calculate final score
@@ -298,6 +504,19 @@ def _assess_text_quality(text):
 
     return quality_score
 
+def warm_up_ocr():
+    """
+    Run tesseract once on a tiny blank image so the binary and its language data
+    are in the OS page cache before the first real upload.
+    """
+    try:
+        _image_to_text(Image.new('L', (32, 32), 255))
+        logger.info("[CHORD_OCR] Tesseract warm-up complete")
+        return True
+    except Exception as e:
+        logger.warning(f"[CHORD_OCR] Tesseract warm-up failed: {str(e)}")
+        return False
+
 def test_ocr_extraction():
     """Test function for development - can be removed in production"""
     try:
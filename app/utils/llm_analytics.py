@@ -6,13 +6,37 @@ Implements PostHog LLM Analytics with comprehensive properties tracking
 import os
 import time
 import uuid
+import queue
+import atexit
 import logging
+import threading
 from typing import Dict, Any, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Events are queued and sent to PostHog's /batch/ endpoint by a background thread,
+# at most MAX_BATCH_SIZE per request and at least every FLUSH_INTERVAL_SECONDS
+MAX_BATCH_SIZE = 100
+FLUSH_INTERVAL_SECONDS = 2.0
+# Telemetry is non-critical: if PostHog is unreachable, drop events rather than grow without bound
+MAX_QUEUED_EVENTS = 10000
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Serialize a batch payload; orjson is much faster on long $ai_input/$ai_output_choices."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
 class LLMAnalytics:
     """Utility class for tracking LLM interactions with PostHog LLM Analytics"""
 
@@ -22,10 +46,24 @@ class LLMAnalytics:
         self.enabled = bool(self.posthog_api_key)
         self.current_trace_id = None
 
+        self._queue = queue.Queue(maxsize=MAX_QUEUED_EVENTS)
+
+        # One keep-alive session for every batch; retries transient PostHog failures
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "User-Agent": "GuitarPracticeApp/1.0"
+        })
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=None)  # Also retry POST; a duplicate batch is harmless for telemetry
+        self._session.mount("https://", HTTPAdapter(max_retries=retries))
+
         if not self.enabled:
             logger.warning("PostHog API key not found. LLM Analytics disabled.")
         else:
             logger.info("PostHog LLM Analytics enabled")
+            threading.Thread(target=self._flush_loop, name='posthog-flush', daemon=True).start()
+            atexit.register(self._flush)
 
     def start_trace(self, trace_name: str = "autocreate_chord_charts") -> str:
         """Start a new trace and return the trace ID"""
@@ -66,10 +104,10 @@ class LLMAnalytics:
             trace_id: Optional trace ID (uses current trace if not provided)
 
         Returns:
-            Generation ID for linking spans
+            Generation ID for linking spans ("" when analytics is disabled)
         """
         if not self.enabled:
-            return str(uuid.uuid4())
+            return ""  # Nothing is sent, so there is nothing to link to
 
         generation_id = str(uuid.uuid4())
 
@@ -159,10 +197,10 @@ class LLMAnalytics:
             error: Error message if applicable
 
         Returns:
-            Span ID
+            Span ID ("" when analytics is disabled)
         """
         if not self.enabled:
-            return str(uuid.uuid4())
+            return ""  # Nothing is sent, so there is nothing to link to
 
         span_id = str(uuid.uuid4())
         end_time = end_time or time.time()
@@ -201,45 +239,74 @@ class LLMAnalytics:
         return span_id
 
     def _capture_event(self, event_name: str, properties: Dict[str, Any]):
-        """Send event to PostHog using batch API for manual capture"""
+        """Queue an event for the background sender (PostHog manual capture format)"""
         if not self.enabled:
             return
 
-        try:
-            from datetime import datetime
+        from datetime import datetime
 
-            # Create individual event payload following PostHog manual capture format
-            event_payload = {
+        # Create individual event payload following PostHog manual capture format
+        try:
+            self._queue.put_nowait({
                 "event": event_name,
                 "properties": properties,
                 "distinct_id": "guitar_practice_app_user",  # Single user app
-                "timestamp": datetime.utcnow().isoformat() + "Z"  # ISO8601 format
-            }
-
+                "timestamp": datetime.utcnow().isoformat() + "Z"  # ISO8601 format, at capture time
+            })
+        except queue.Full:
+            # Never block the request path on telemetry
+            logger.warning(f"PostHog event queue full, dropping {event_name}")
+
+    def _flush_loop(self):
+        """Background thread: gather queued events into batches and send them"""
+        while True:
+            events = [self._queue.get()]  # Block until there is something to send
+            deadline = time.monotonic() + FLUSH_INTERVAL_SECONDS
+            while len(events) < MAX_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    events.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._send_batch(events)
+
+    def _flush(self):
+        """Send everything still queued (registered with atexit)"""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for i in range(0, len(events), MAX_BATCH_SIZE):
+            self._send_batch(events[i:i + MAX_BATCH_SIZE])
+
+    def _send_batch(self, events: List[Dict[str, Any]]):
+        """Send events to PostHog using batch API for manual capture"""
+        try:
             # Wrap in batch format following PostHog API docs
             batch_payload = {
                 "api_key": self.posthog_api_key,
-                "batch": [event_payload]
+                "batch": events
             }
 
             # Send to PostHog batch endpoint
-            response = requests.post(
+            response = self._session.post(
                 f"{self.posthog_host}/batch/",
-                json=batch_payload,  # Use json= for proper encoding
-                headers={
-                    "Content-Type": "application/json",
-                    "User-Agent": "GuitarPracticeApp/1.0"
-                },
+                data=_dumps(batch_payload),  # Content-Type is set on the session
                 timeout=10
             )
 
+            event_names = ", ".join(sorted({event["event"] for event in events}))
             if 200 <= response.status_code <= 299:
-                logger.info(f"Successfully tracked {event_name} event to PostHog LLM Analytics")
+                logger.info(f"Successfully tracked {len(events)} events ({event_names}) to PostHog LLM Analytics")
             else:
-                logger.warning(f"Failed to track {event_name} event: {response.status_code} - {response.text}")
+                logger.warning(f"Failed to track {len(events)} events ({event_names}): {response.status_code} - {response.text}")
 
         except Exception as e:
-            logger.error(f"Error tracking {event_name} event: {str(e)}")
+            logger.error(f"Error tracking {len(events)} events: {str(e)}")
 
 # Global instance
 llm_analytics = LLMAnalytics()
@@ -2,6 +2,7 @@ from dotenv import load_dotenv
 import os
 from app import app
 import secrets
+import threading
 
 load_dotenv()
 
@@ -10,5 +11,16 @@ os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 app.secret_key = secrets.token_hex(16)
 app.config['OAUTH2_REDIRECT_URI'] = 'http://localhost:5000/oauth2callback'
 
+# Warm up tesseract in the background so the first chord OCR upload doesn't pay the cold start.
+# Started here, once the app and its routes are fully imported, rather than for every importer of app.
+def _warm_up_ocr():
+    try:
+        from app.utils.chord_ocr import warm_up_ocr
+        warm_up_ocr()
+    except Exception as e:
+        app.logger.warning(f'OCR warm-up skipped: {e}')
+
+threading.Thread(target=_warm_up_ocr, name='ocr-warm-up', daemon=True).start()
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -81,6 +81,12 @@ CREATE INDEX idx_routine_items_completion ON routine_items(routine_id, completed
 CREATE INDEX idx_chord_charts_item_id ON chord_charts(item_id);
 CREATE INDEX idx_chord_charts_title ON chord_charts(title);
 CREATE INDEX idx_chord_charts_item_order ON chord_charts(item_id, order_col);
+-- GIN over the split comma-separated ItemID list so shared-chart membership tests are indexed
+CREATE INDEX idx_chord_charts_item_ids ON chord_charts USING GIN (string_to_array(replace(item_id, ' ', ''), ','));
+
+-- Trigram index so LOWER(name) LIKE '%...%' chord searches avoid a sequential scan
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_common_chords_name_trgm ON common_chords USING GIN (LOWER(name) gin_trgm_ops);
 
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -19,7 +19,37 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import DatabaseTransaction
 from app.models import Item, Routine, RoutineItem, ChordChart, ActiveRoutine
-from sqlalchemy import text, func
+from sqlalchemy import text, func, select, literal, union_all
+
+def read_per_table(db, tables):
+    """Read each table's MAX(id) and sequence position separately, recording per-table errors."""
+    max_ids, seq_values, errors = {}, {}, {}
+
+    for table_name, model, id_field in tables:
+        try:
+            # Savepoint per statement: a failed query must not abort the reads for the other tables
+            with db.begin_nested():
+                max_id = db.query(func.max(getattr(model, id_field))).scalar() or 0
+        except Exception as e:
+            errors[table_name] = f"Error: {str(e)[:40]}"
+            continue
+        max_ids[table_name] = max_id
+
+        seq_name = f"{table_name}_{id_field}_seq"
+        try:
+            with db.begin_nested():
+                seq_value = db.execute(text('''
+                    SELECT COALESCE(last_value, start_value)
+                    FROM pg_sequences
+                    WHERE schemaname = current_schema() AND sequencename = :seq_name
+                '''), {'seq_name': seq_name}).scalar()
+        except Exception as e:
+            errors[table_name] = f"Max ID: {max_id:5} | Seq: ERROR - {str(e)[:30]}"
+            continue
+        if seq_value is not None:
+            seq_values[seq_name] = seq_value
+
+    return max_ids, seq_values, errors
 
 def check_and_fix_sequences(auto_fix=False):
     """Check all sequences and optionally fix them."""
@@ -39,31 +69,44 @@ def check_and_fix_sequences(auto_fix=False):
 
         issues_found = []
 
-        for table_name, model, id_field in tables:
-            try:
-                id_column = getattr(model, id_field)
-                max_id = db.query(func.max(id_column)).scalar() or 0
+        try:
+            # Two round trips in total: every table's MAX(id), then every sequence's position
+            max_ids = dict(db.execute(union_all(*[
+                select(literal(table_name), func.max(getattr(model, id_field)))
+                for table_name, model, id_field in tables
+            ])).all())
+            seq_values = dict(db.execute(text('''
+                SELECT sequencename, COALESCE(last_value, start_value)
+                FROM pg_sequences
+                WHERE schemaname = current_schema() AND sequencename = ANY(:seq_names)
+            '''), {'seq_names': [f"{table_name}_{id_field}_seq" for table_name, _, id_field in tables]}).all())
+            errors = {}
+        except Exception as e:
+            # Fall back to one table at a time so the failing table is reported and the rest still checked
+            db.rollback()
+            print(f"Batched read failed ({str(e)[:40]}), checking tables one by one")
+            max_ids, seq_values, errors = read_per_table(db, tables)
 
-                # Get sequence current value
-                seq_name = f"{table_name}_{id_field}_seq"
-                try:
-                    result = db.execute(text(f"SELECT last_value FROM {seq_name}"))
-                    seq_value = result.scalar()
+        for table_name, model, id_field in tables:
+            if table_name in errors:
+                print(f"{table_name:20} | {errors[table_name]}")
+                continue
 
-                    out_of_sync = seq_value < max_id
-                    status = "✗ OUT OF SYNC" if out_of_sync else "✓ OK"
+            max_id = max_ids.get(table_name) or 0
 
-                    print(f"{table_name:20} | Max ID: {max_id:5} | Seq: {seq_value:5} | {status}")
+            # Get sequence current value (tables without a sequence are skipped)
+            seq_name = f"{table_name}_{id_field}_seq"
+            seq_value = seq_values.get(seq_name)
+            if seq_value is None:
+                continue
 
-                    if out_of_sync:
-                        issues_found.append((table_name, seq_name, max_id, seq_value))
+            out_of_sync = seq_value < max_id
+            status = "✗ OUT OF SYNC" if out_of_sync else "✓ OK"
 
-                except Exception as e:
-                    if "does not exist" not in str(e):
-                        print(f"{table_name:20} | Max ID: {max_id:5} | Seq: ERROR - {str(e)[:30]}")
+            print(f"{table_name:20} | Max ID: {max_id:5} | Seq: {seq_value:5} | {status}")
 
-            except Exception as e:
-                print(f"{table_name:20} | Error: {str(e)[:40]}")
+            if out_of_sync:
+                issues_found.append((table_name, seq_name, max_id, seq_value))
 
         print("=" * 70)
 
@@ -76,12 +119,20 @@ def check_and_fix_sequences(auto_fix=False):
 
                 if auto_fix:
                     print(f"  → Fixing {seq}...")
-                    db.execute(text(f"SELECT setval('{seq}', {max_id})"))
-                    db.commit()
-                    print(f"  ✓ Fixed!")
                 else:
                     print(f"  Fix: SELECT setval('{seq}', {max_id});")
 
+            if auto_fix:
+                # All fixes in one statement; DatabaseTransaction commits them together on exit
+                db.execute(text('''
+                    SELECT setval(CAST(fix.seq_name AS regclass), fix.max_id)
+                    FROM unnest(CAST(:seq_names AS text[]), CAST(:max_ids AS bigint[])) AS fix(seq_name, max_id)
+                '''), {
+                    'seq_names': [seq for _, seq, _, _ in issues_found],
+                    'max_ids': [max_id for _, _, max_id, _ in issues_found]
+                })
+                print(f"  ✓ Fixed {len(issues_found)} sequence(s)!")
+
             print("=" * 70)
 
             if not auto_fix: